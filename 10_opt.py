@@ -1,4 +1,10 @@
 import streamlit as st
+import matplotlib.pyplot as plt
+import numpy as np
+import datos_compartidos
+from panel import PanelRetornos
+from simulacion import estadisticos_anuales
+from optimizador import min_varianza_objetivo
 
 # Configuración inicial de la página de Streamlit
 st.set_page_config(
@@ -35,22 +41,46 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# URL de la imagen en el repositorio de GitHub
-image_url = "https://raw.githubusercontent.com/Alexlvsya/ProyectoSeminario/main/min10.png"
+# Mínima varianza con objetivo de 10% anual; como en el cálculo original se permiten posiciones cortas
+symbols = ['EMB', 'XLE', 'SPXL', 'EEM', 'SHV']
+precios = datos_compartidos.precios(symbols, '2010-01-01', '2020-12-31')[symbols]
+mu, cov = estadisticos_anuales(PanelRetornos.desde_precios(precios, dtype="float32", relleno=0.0))
+opt_obj = min_varianza_objetivo(mu, cov, 0.10, limites=None)
 
-# Mostrar la imagen centrada con un mayor tamaño
-st.markdown(
-    f"""
-    <div style="display: flex; justify-content: center; align-items: center; margin-top: 20px;">
-        <img src="{image_url}" alt="Portfolio Visualization" style="width: 80%; border-radius: 10px; border: 2px solid #34495E;">
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-st.write('''The model shows an explicit preference for the SPXL (the SPXL has the Minimum variance in the 
-         individual analysis of each ETF), followed by the EMB etf, the main and most interesting thing that 
-         differenciate this model from the others is that this allocation is sub-invested in the EEM etf, we 
-         think its because of the high volatility and small returns on the time period. ''')
+# Pesos ordenados de mayor a menor
+orden = opt_obj['pesos'].argsort()[::-1]
+activos = [symbols[i] for i in orden]
+pesos = opt_obj['pesos'][orden]
+colors = ["#2C3E50", "#1ABC9C", "#6A5ACD", "#4682B4", "#708090"]
+
+fig, ax = plt.subplots(figsize=(12, 6))
+ax.bar(activos, pesos, color=colors, edgecolor="black", linewidth=0.7)
+for i, peso in enumerate(pesos):
+    ax.text(i, peso + (0.01 if peso >= 0 else -0.01), f"{100 * peso:.2f}%",
+            ha="center", va="bottom" if peso >= 0 else "top",
+            fontsize=12, fontweight="bold", color="#2C3E50")
+ax.set_title("Minimum Variance with 10% Objective Portfolio Weights", fontsize=18, weight="bold")
+ax.set_ylabel("Weight (%)", fontsize=14)
+ax.set_xlabel("Assets", fontsize=14)
+ax.axhline(0, color="black", linestyle="--", linewidth=0.8)
+ax.grid(linestyle="--", alpha=0.3)
+ax.set_facecolor("lightgray")
+
+st.pyplot(fig)
+
+# El comentario se arma con los pesos del optimizador para que coincida con la gráfica
+def analisis_pesos():
+    volatilidades = np.sqrt(np.diag(np.asarray(cov)))
+    menor_vol = symbols[volatilidades.argmin()]
+    ultimo = symbols.index(activos[-1])
+    posicion = (f"is sold short ({pesos[-1]:.2%})" if pesos[-1] < 0
+                else f"gets the smallest allocation ({pesos[-1]:.2%})")
+    return (f"The model shows an explicit preference for {activos[0]} ({pesos[0]:.2%}), followed by "
+            f"{activos[1]} ({pesos[1]:.2%}); {menor_vol} has the lowest individual volatility "
+            f"({volatilidades.min():.2%} annual). In this allocation {activos[-1]} {posicion}: over the period "
+            f"its annual return was {mu[ultimo]:.2%} with a volatility of {volatilidades[ultimo]:.2%}.")
+
+st.write(analisis_pesos())
 # Pie de página profesional
 st.markdown(
     """
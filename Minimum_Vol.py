@@ -1,13 +1,23 @@
 import streamlit as st 
 import matplotlib.pyplot as plt
 from numpy import around
+import datos_compartidos
+from panel import PanelRetornos
+from simulacion import estadisticos_anuales
+from optimizador import min_varianza
+from tbill import tasa_anual_promedio
 
-# Datos proporcionados
-k = [('EMB', 0.02), ('XLE', 0.0), ('SPXL', 99.91), ('EEM', 0.03), ('SHV', 0.04)]
+# Portafolio de mínima varianza (mismos datos que max_sharpe_optr.py)
+symbols = ['EMB', 'XLE', 'SPXL', 'EEM', 'SHV']
+precios = datos_compartidos.precios(symbols, '2010-01-01', '2020-12-31')[symbols]
+mu, cov = estadisticos_anuales(PanelRetornos.desde_precios(precios, dtype="float32", relleno=0.0))
+opt_var = min_varianza(mu, cov, tasa_libre_riesgo=tasa_anual_promedio('2010-01-01', '2020-12-31'))
+
+k = list(zip(symbols, around(100 * opt_var['pesos'], 2)))
 colors = ["#2C3E50", "#1ABC9C", "#6A5ACD", "#4682B4", "#708090"]
 
 stats = ['Returns', 'Volatility', 'Sharpe Ratio']
-portfolio_stats_values = [0.04, 0.34, 0.1198]  # Valores de ejemplo; reemplaza con `portfolio_stats(opt_var['x'])` en tu implementación.
+portfolio_stats_values = [opt_var['rendimiento'], opt_var['volatilidad'], opt_var['sharpe']]
 
 # Configuración de la página
 st.set_page_config(
@@ -56,8 +66,7 @@ stats_table = list(zip(stats, around(portfolio_stats_values, 4)))
 
 # Mostrar estadísticas en tabla
 st.table(stats_table)
-st.write('''If we go back to the ETF stats, que will notice that the SPXL is the ETF with the 
-         minimum volatility, so in this case, the optimization is giving 
+st.write('''If we go back to the ETF stats, we will notice that the optimization is giving 
          us a corner solution, allocating almost all of the portfolio 
          value in just one ETF, the one that has the Minimum Volatility ''')
 # Pie de página
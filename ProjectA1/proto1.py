@@ -1,20 +1,24 @@
 #requirements
-import yfinance as yf
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import datetime as dt
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import obtener_precios
+from metadata import obtener_info
+from descargas import iterar_descargas
+from importaciones import perezoso
+
+# matplotlib sólo se carga si se dibuja alguna gráfica
+plt = perezoso("matplotlib.pyplot")
 
 def accion(symbol,start_date,end_date):
-  asset_data = yf.download(symbol, start = start_date, end = end_date)['Close']
-  asset_info = yf.Ticker(symbol).info
+  asset_data = obtener_precios([symbol], start_date, end_date)
+  asset_info = obtener_info(symbol)
   normalized_price = asset_data / asset_data.iloc[0] * 100
  #estimating market cap
-  marketCap = asset_data.iloc[-1] * yf.Ticker(symbol).info['sharesOutstanding']
+  marketCap = asset_data.iloc[-1] * asset_info['sharesOutstanding']
   pe_ratio = asset_info.get('trailingPE', None)
   pb_ratio = asset_info.get('priceToBook', None)
   #market cap = asset's last price * number of outstanding shares
@@ -57,47 +61,35 @@ def accion(symbol,start_date,end_date):
   st.pyplot(fig)
 
 
-def asset_comparisson(symbols):
+def asset_comparisson(symbols, start_date, end_date):
   normalized_data = pd.DataFrame()
-  for s in symbols: 
-    asset_dta = yf.download(s, start = start_date, end = end_date)['Close']
-    normalized_data[s] = asset_dta / asset_dta.iloc[0] *100
-
-#graficar comparación
-  plt.figure(figsize = (12, 6))
-  normalized_data.plot(title = 'Return Comparisson')
-  plt.xlabel('Date')
-  plt.ylabel('Return %')
-  plt.legend(symbols)
-  plt.grid(True)
-  plt.show()
-
+  grafica = st.empty()
+  #las series se descargan en paralelo y la gráfica se actualiza con cada una que llega
+  for s, asset_dta, error in iterar_descargas(symbols, start_date, end_date):
+    if error is not None or asset_dta.empty:
+      st.warning(f"No se pudieron descargar los precios de {s}: {error or 'sin datos'}")
+      continue
+    normalized_data = pd.concat([normalized_data, (asset_dta / asset_dta.iloc[0] *100).rename(s)], axis = 1)
+    grafica.line_chart(normalized_data)
+
+  symbols = list(normalized_data.columns)
   metrics = {
         'P/E Ratio': [],
         'P/B Ratio': [],
         'Market Cap in Billions': [],
         'Dividend Yield':[]
     }
+  infos = obtener_info(symbols)
   for s in symbols:
-    asset_ifo = yf.Ticker(s).info
+    asset_ifo = infos[s]
     metrics['P/E Ratio'].append(asset_ifo.get('trailingPE', None))
     metrics['P/B Ratio'].append(asset_ifo.get('priceToBook', None))
     metrics['Market Cap in Billions'].append(asset_ifo.get('marketCap', 0) / 1e9)
     metrics['Dividend Yield'].append(asset_ifo.get('dividendYield', 0) * 100 if asset_ifo.get('dividendYield', 0) else None)
     
   df_metrics = pd.DataFrame(metrics, index = symbols) #el indice de cada fila sera el simbolo de cada accion
-  print('\nMetric Comparisson between the assets')
-  print(df_metrics)
-
-symbol = input(str("Ingrese el símbolo de la acción: "))
-print("Las fechas deben estar en formato YYYY/MM/DD")
-#getting the dates (period)
-start_date = input(str("Ingrese la fecha de inicio: "))
-end_date = input(str("Ingrese la fecha de finalización: "))
-accion(symbol, start_date, end_date)
- 
-symbols = input(str("Ingrese los símbolos de las acciones a comparar, separados por comas: ")).split(',')
-asset_comparisson(symbols)
+  st.subheader('Metric Comparisson between the assets')
+  st.dataframe(df_metrics)
 
 
 # Configuración de la página de Streamlit
@@ -126,5 +118,16 @@ if selected_option == "Fundamental Analysis":
             accion(symbol, start_date, end_date)
         else:
             st.warning("Por favor, complete todos los campos antes de continuar.")
+elif selected_option == "Asset Comparisson":
+    symbols = st.text_input("Ingrese los símbolos de las acciones a comparar, separados por comas:", "AAPL,MSFT")
+    start_date = st.date_input("Ingrese la fecha de inicio:").strftime('%Y-%m-%d')
+    end_date = st.date_input("Ingrese la fecha de finalización:").strftime('%Y-%m-%d')
+
+    if st.button("Comparar"):
+        seleccion = [s.strip().upper() for s in symbols.split(',') if s.strip()]
+        if seleccion:
+            asset_comparisson(seleccion, start_date, end_date)
+        else:
+            st.warning("Por favor, ingrese al menos un símbolo.")
 else:
    st.write('Under Construction...')
\ No newline at end of file
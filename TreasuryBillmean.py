@@ -5,41 +5,27 @@ Created on Wed Dec  4 12:59:06 2024
 @author: alexr
 """
 import streamlit as st 
-import pandas as pd
-from datetime import datetime
+from tbill import RUTA_DATOS, cargar_tbill
 
 def calcular_promedio_tbill(ruta_csv, fecha_inicio, fecha_fin):
     """
     Calcula el promedio de la tasa del Treasury Bill desde un archivo CSV para un rango de fechas.
 
-    :param ruta_csv: Ruta al archivo CSV con los datos. Debe tener columnas "Fecha" y "Tasa".
+    El archivo se lee una sola vez por proceso (tbill.cargar_tbill) y cada consulta
+    se resuelve con búsqueda binaria sobre sumas acumuladas.
+
+    :param ruta_csv: Ruta al archivo CSV con los datos. Debe tener columnas "Date" y "Price".
     :param fecha_inicio: Fecha inicial en formato 'YYYY-MM-DD'.
     :param fecha_fin: Fecha final en formato 'YYYY-MM-DD'.
     :return: Promedio de la tasa dentro del rango de fechas especificado o un mensaje de error.
     """
     try:
-        # Leer el archivo CSV
-        datos = pd.read_csv(ruta_csv)
-        
-        # Asegurarse de que la columna Fecha sea de tipo datetime
-        datos['Date'] = pd.to_datetime(datos['Date'])
-        
-        # Convertir las fechas de entrada a objetos datetime
-        fecha_inicio = datetime.strptime(fecha_inicio, '%Y-%m-%d')
-        fecha_fin = datetime.strptime(fecha_fin, '%Y-%m-%d')
-        
-        # Filtrar los datos para el rango de fechas
-        datos_filtrados = datos[(datos['Date'] >= fecha_inicio) & (datos['Date'] <= fecha_fin)]
-        
-        # Calcular el promedio de la columna "Tasa"
-        promedio = datos_filtrados['Price'].mean()
-        
-        return promedio
+        return cargar_tbill(ruta_csv).promedio(fecha_inicio, fecha_fin)
     
     except Exception as e:
         return f"Error al procesar el archivo: {e}"
 
-ruta_csv ="C:\ProyectoSeminario\datos.csv"
+ruta_csv = RUTA_DATOS
 fecha_inicio = "2010-04-01"
 fecha_fin = "2024-12-04"
 promedio = calcular_promedio_tbill(ruta_csv, fecha_inicio, fecha_fin)
@@ -0,0 +1,225 @@
+#Artefactos precalculados para que las páginas no recalculen en cada interacción
+#
+#Uso: python artifacts.py   (materializa todos los artefactos de las páginas)
+
+import os
+import pickle
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from drawdown import calcular_drawdown, obtener_max_drawdown_info, top_drawdowns
+from backtest import backtest_portafolios
+from bl_pipeline import VISTAS, INTERVALOS, black_litterman
+from bootstrap import intervalos_confianza
+from covarianza import obtener_covarianza
+from metricas import metricas_etfs
+from metricas_moviles import metricas_moviles
+from memoria import huella
+from montecarlo import MODELOS, var_montecarlo
+from panel import PanelRetornos, como_matriz
+from portfolio_config import nombres_portafolios, pesos_list
+from simulacion import estadisticos_anuales, simular_portafolios
+from tbill import resolver_tasa, tasa_anual_promedio, tasa_libre_riesgo
+from var_cvar import curva_riesgo_cola
+
+# Cambiar VERSION invalida todos los artefactos cuando cambia la forma de calcularlos
+VERSION = 3
+RUTA_ARTEFACTOS = Path(__file__).resolve().parent / ".artifacts"
+
+# Días sin uso tras los que se borra un artefacto: las claves que cambian a diario
+# (como la de draw_etf.py) dejan archivos que nunca se vuelven a leer
+DIAS_SIN_USO = 30
+
+def podar_artefactos(dias_sin_uso=DIAS_SIN_USO):
+    """Borra las versiones anteriores y los artefactos que no se han usado en 'dias_sin_uso' días"""
+    if not RUTA_ARTEFACTOS.exists():
+        return 0
+    limite = datetime.now().timestamp() - dias_sin_uso * 86400
+    borrados = 0
+    for carpeta in RUTA_ARTEFACTOS.iterdir():
+        if not carpeta.is_dir():
+            continue
+        for ruta in carpeta.iterdir():
+            try:
+                if carpeta.name != f"v{VERSION}" or ruta.stat().st_mtime < limite:
+                    ruta.unlink()
+                    borrados += 1
+            except FileNotFoundError:
+                pass
+        if carpeta.name != f"v{VERSION}":
+            try:
+                carpeta.rmdir()
+            except OSError:
+                pass
+    return borrados
+
+def cargar_o_construir(nombre, clave, construir):
+    """Carga el artefacto nombre/clave o lo construye y guarda si no existe.
+
+    Al cargar se actualiza la fecha de modificación del archivo, que
+    podar_artefactos usa como fecha del último uso; cada artefacto nuevo
+    aprovecha para borrar los que ya no se usan.
+    """
+    carpeta = RUTA_ARTEFACTOS / f"v{VERSION}"
+    ruta = carpeta / f"{nombre}-{clave}.pkl"
+    try:
+        with open(ruta, "rb") as f:
+            resultado = pickle.load(f)
+        os.utime(ruta)
+        return resultado
+    except FileNotFoundError:
+        pass
+
+    resultado = construir()
+    carpeta.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporal, "wb") as f:
+        pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta)
+    podar_artefactos()
+    return resultado
+
+# Artefactos de cada página; la clave depende sólo de los datos y parámetros.
+# Sin tasa libre de riesgo explícita se usa la del T-bill alineada con las fechas,
+# diaria y multiplicada por 'escala' para quedar en las unidades de los retornos
+# (escala=100 con retornos en %, como en var_cvar_metricsA1.py)
+
+def artefacto_metricas_etfs(daily_returns, risk_free_rate=None, escala=1):
+    risk_free_rate = resolver_tasa(risk_free_rate, daily_returns.index, escala=escala)
+    return cargar_o_construir(
+        "metricas_etfs", huella(daily_returns, risk_free_rate),
+        lambda: metricas_etfs(daily_returns, risk_free_rate))
+
+def artefacto_metricas_moviles(daily_returns, ventana=252, risk_free_rate=None, escala=1):
+    """Métricas en ventanas móviles de cada ETF (diccionario métrica -> DataFrame)"""
+    risk_free_rate = resolver_tasa(risk_free_rate, daily_returns.index, escala=escala)
+    return cargar_o_construir(
+        "metricas_moviles", huella(daily_returns, ventana, risk_free_rate),
+        lambda: metricas_moviles(daily_returns, ventana, risk_free_rate=risk_free_rate))
+
+def artefacto_riesgo_cola(daily_returns, alphas):
+    """VaR y CVaR de cada ETF con todos los métodos de var_cvar.py para varios niveles"""
+    alphas = np.asarray(alphas, dtype=float)
+    return cargar_o_construir(
+        "riesgo_cola", huella(daily_returns, alphas),
+        lambda: curva_riesgo_cola(daily_returns, alphas))
+
+def artefacto_drawdowns(datos, n=5):
+    """Drawdown, HWM, máximo drawdown y top-n episodios de todos los activos"""
+    def construir():
+        drawdown, hwm = calcular_drawdown(datos)
+        return {
+            "drawdown": drawdown,
+            "hwm": hwm,
+            "info": obtener_max_drawdown_info(datos),
+            "top": top_drawdowns(datos, n)
+        }
+    return cargar_o_construir("drawdowns", huella(datos, n), construir)
+
+def artefacto_backtest(retornos, pesos_list, nombres, tasa=None):
+    """Curvas de valor, drawdowns y métricas de los portafolios de pesos fijos"""
+    if tasa is None:
+        tasa = tasa_libre_riesgo(retornos.index)
+    clave = huella(retornos, np.asarray(pesos_list), list(nombres), tasa)
+    return cargar_o_construir(
+        "backtest", clave,
+        lambda: backtest_portafolios(retornos, pesos_list, nombres, tasa))
+
+def artefacto_intervalos_confianza(retornos_portafolio, n_muestras=2000, esquema='estacionario', semilla=0):
+    """Intervalos de confianza por bootstrap de bloques de las métricas de un portafolio"""
+    tasa = tasa_libre_riesgo(retornos_portafolio.index)
+    return cargar_o_construir(
+        "intervalos_confianza", huella(retornos_portafolio, n_muestras, esquema, semilla, tasa),
+        lambda: intervalos_confianza(retornos_portafolio, n_muestras, esquema=esquema,
+                                     tasa_libre_riesgo=tasa, semilla=semilla))
+
+def artefacto_var_montecarlo(retornos, pesos, n_escenarios=1_000_000, alphas=(0.01, 0.05), semilla=0, procesos=1):
+    """VaR y CVaR Monte Carlo de un portafolio con cada modelo (una fila por modelo).
+
+    Por omisión corre en el proceso actual (las páginas lo llaman dentro del
+    servidor de Streamlit); main() lo precalcula con todos los núcleos
+    (procesos=None). El resultado no depende de 'procesos', así que no va en la clave.
+    """
+    def construir():
+        matriz = como_matriz(retornos)
+        mu, cov = np.nanmean(matriz, axis=0, dtype=float), obtener_covarianza(matriz, periodos=1)
+        filas = {}
+        for modelo in MODELOS:
+            tabla = var_montecarlo(pesos, mu, cov, n_escenarios, modelo, alphas,
+                                   historico=retornos, semilla=semilla, procesos=procesos)
+            filas[modelo] = {f"{medida} {100 * (1 - a):.0f}%": tabla.loc[a, medida]
+                             for a in tabla.index for medida in ['VaR', 'CVaR']}
+        return pd.DataFrame(filas).T
+    clave = huella(retornos, np.asarray(pesos), n_escenarios, tuple(alphas), semilla)
+    return cargar_o_construir("var_montecarlo", clave, construir)
+
+def artefacto_simulacion(returns, numofportfolio=10000, tasa=None):
+    """Simulación Monte Carlo de max_sharpe_optr.py (en %, como la tabla de la página)"""
+    if tasa is None:
+        tasa = tasa_anual_promedio(returns.index[0], returns.index[-1])
+
+    def construir():
+        mu, cov = estadisticos_anuales(returns)
+        wts, rets, vols, _ = simular_portafolios(mu, cov, numofportfolio)
+        portdf = 100 * pd.DataFrame({
+            'port_rets': rets,
+            'port_vols': vols,
+            'weights': list(wts)
+        })
+        portdf['sharpe_ratio'] = (portdf['port_rets'] - 100 * tasa) / portdf['port_vols']
+        return round(portdf, 2)
+    return cargar_o_construir("simulacion", huella(returns, numofportfolio, tasa), construir)
+
+def artefacto_black_litterman(precios, precios_mercado, capitalizacion, vistas=VISTAS, intervalos=INTERVALOS):
+    """Prior, posterior y pesos de máximo Sharpe del modelo de Black-Litterman de bl.py"""
+    clave = huella(precios, precios_mercado, capitalizacion, vistas, intervalos)
+    return cargar_o_construir(
+        "black_litterman", clave,
+        lambda: black_litterman(precios, precios_mercado, capitalizacion, vistas, intervalos))
+
+def main():
+    """Materializa los artefactos con los mismos parámetros que usan las páginas"""
+    from price_store import obtener_precios
+
+    etfs = ["EMB", "XLE", "SPXL", "EEM", "SHV"]
+
+    # var_cvar_metricsA1.py
+    data = obtener_precios(etfs, "2010-01-01", "2023-12-31", campo="Adj Close")
+    rf = tasa_libre_riesgo(data.index) * 100
+    daily_returns = PanelRetornos.desde_precios(data[etfs], dtype="float32", escala=100)
+    artefacto_metricas_etfs(daily_returns, rf)
+    artefacto_metricas_moviles(daily_returns, 252, rf)
+    artefacto_riesgo_cola(daily_returns, np.linspace(0.005, 0.10, 20))
+
+    # draw_etf.py
+    datos = obtener_precios(etfs, "2010-01-01", datetime.now()).ffill().dropna()
+    artefacto_drawdowns(datos)
+
+    # portfolio_backtesting.py
+    precios = obtener_precios(etfs, "2021-01-01").ffill().dropna()
+    retornos = PanelRetornos.desde_precios(precios, dtype="float32", quitar_primera=True)
+    resultado = artefacto_backtest(retornos, pesos_list, nombres_portafolios)
+    for nombre in nombres_portafolios:
+        artefacto_intervalos_confianza(resultado['retornos'][nombre])
+    for pesos in pesos_list:
+        artefacto_var_montecarlo(retornos, pesos, procesos=None)
+
+    # max_sharpe_optr.py
+    df = obtener_precios(etfs, "2010-01-01", "2020-12-31")[etfs]
+    artefacto_simulacion(PanelRetornos.desde_precios(df, dtype="float32", relleno=0.0), 10000,
+                         tasa_anual_promedio("2010-01-01", "2020-12-31"))
+
+    # bl.py
+    from bl_pipeline import ACTIVOS, INICIO, capitalizaciones
+    precios_bl = obtener_precios(ACTIVOS, INICIO, campo="Adj Close")
+    artefacto_black_litterman(precios_bl, obtener_precios("SPY", INICIO, campo="Adj Close"),
+                              capitalizaciones(precios_bl.columns))
+
+    borrados = podar_artefactos()
+    print(f"Artefactos v{VERSION} en {RUTA_ARTEFACTOS} ({borrados} sin usar borrados)")
+
+if __name__ == "__main__":
+    main()
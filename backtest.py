@@ -0,0 +1,134 @@
+#Backtest vectorizado de muchos portafolios de pesos constantes
+
+import numpy as np
+import pandas as pd
+from drawdown import calcular_drawdown
+from metricas import metricas_columnas
+from panel import como_matriz, etiquetas
+
+def backtest_portafolios(retornos, pesos, nombres=None, tasa_libre_riesgo=None, base=100):
+    """Backtest de P portafolios sobre una matriz de retornos (T x N).
+
+    'pesos' es una matriz (P x N). Los retornos de todos los portafolios salen de
+    un solo producto matricial y las curvas de valor, drawdowns y métricas se
+    obtienen con reducciones por columna. Regresa un diccionario con DataFrames
+    (T x P) 'retornos', 'valor' y 'drawdown' y la tabla 'metricas' (P filas).
+    """
+    pesos = np.atleast_2d(np.asarray(pesos, dtype=float))
+    if nombres is None:
+        nombres = [f"Portafolio {i + 1}" for i in range(pesos.shape[0])]
+    indice, _ = etiquetas(retornos)
+
+    # Los pesos toman el dtype de los retornos: un panel float32 no se sube a float64
+    matriz = como_matriz(retornos)
+    retornos_portafolios = matriz @ pesos.T.astype(matriz.dtype, copy=False)
+    valor = base * np.cumprod(1 + retornos_portafolios, axis=0)
+
+    retornos_portafolios = pd.DataFrame(retornos_portafolios, index=indice, columns=nombres)
+    valor = pd.DataFrame(valor, index=indice, columns=nombres)
+    drawdown, _ = calcular_drawdown(valor)
+
+    return {
+        'retornos': retornos_portafolios,
+        'valor': valor,
+        'drawdown': drawdown,
+        'metricas': metricas_columnas(retornos_portafolios, valor, tasa_libre_riesgo)
+    }
+
+FRECUENCIAS = {'mensual': 'M', 'trimestral': 'Q', 'anual': 'Y'}
+
+def _fines_de_periodo(indice, frecuencia):
+    """Posiciones del último día hábil de cada periodo (sin contar el último día)"""
+    if frecuencia is None:
+        return np.array([], dtype=np.int64)
+    if frecuencia == 'diario':
+        return np.arange(len(indice) - 1)
+    periodos = pd.DatetimeIndex(indice).to_period(FRECUENCIAS[frecuencia]).asi8
+    return np.flatnonzero(periodos[1:] != periodos[:-1])
+
+def backtest_rebalanceo(retornos, pesos, frecuencia='mensual', umbral=None,
+                        costo_proporcional=0.0, costo_fijo=0.0, capital=100, bloque=252,
+                        con_metricas=True, tasa_libre_riesgo=None):
+    """Backtest de un portafolio con rebalanceo y costos de transacción.
+
+    Entre rebalanceos los pesos se desvían con los precios. Se rebalancea al
+    cierre del último día de cada periodo ('diario', 'mensual', 'trimestral',
+    'anual' o None) y, si se da 'umbral', también cuando algún peso se aleja más
+    de 'umbral' de su objetivo. Cada rebalanceo paga costo_proporcional por
+    unidad operada más costo_fijo por activo operado (la compra inicial también).
+
+    El ciclo salta de evento en evento: cada tramo entre rebalanceos se calcula
+    de golpe con cumprod, así que el costo crece con el número de rebalanceos y
+    no con el número de días. Con con_metricas=False se omite la tabla de
+    métricas (útil en barridos de parámetros). La tasa libre de riesgo diaria de
+    las métricas puede ser un escalar o una serie alineada con los retornos.
+    """
+    indice = retornos.index
+    R = como_matriz(retornos)
+    w = np.asarray(pesos, dtype=float)
+    T, N = R.shape
+
+    fines = _fines_de_periodo(indice, frecuencia)
+    valor_activos = np.empty((T, N))
+    costos = np.zeros(T)
+    rebalanceos = []
+
+    # Si los pesos no suman 1 la diferencia queda en efectivo (sin rendimiento),
+    # igual que en backtest_portafolios
+    costo_inicial = costo_proporcional * capital * np.abs(w).sum() + costo_fijo * np.count_nonzero(w)
+    tenencias = w * (capital - costo_inicial)
+    efectivo = (1 - w.sum()) * (capital - costo_inicial)
+    valor_efectivo = np.empty(T)
+
+    t = 0
+    while t < T:
+        k = np.searchsorted(fines, t)
+        fin_calendario = fines[k] if k < len(fines) else T - 1
+        fin = min(fin_calendario, t + bloque - 1)
+
+        valores = tenencias * np.cumprod(1 + R[t:fin + 1], axis=0)
+        rebalancear = fin == fin_calendario and fin < T - 1
+        if umbral is not None:
+            desvio = np.abs(valores / (valores.sum(axis=1, keepdims=True) + efectivo) - w).max(axis=1)
+            rupturas = np.flatnonzero(desvio > umbral)
+            if len(rupturas) and t + rupturas[0] < T - 1:
+                fin = t + rupturas[0]
+                valores = valores[:rupturas[0] + 1]
+                rebalancear = True
+        valor_activos[t:fin + 1] = valores
+        valor_efectivo[t:fin + 1] = efectivo
+
+        if rebalancear:
+            actual = valores[-1]
+            total = actual.sum() + efectivo
+            operaciones = np.abs(w * total - actual)
+            costos[fin] = (costo_proporcional * operaciones.sum()
+                           + costo_fijo * np.count_nonzero(operaciones > 1e-12 * abs(total)))
+            tenencias = w * (total - costos[fin])
+            efectivo = (1 - w.sum()) * (total - costos[fin])
+            rebalanceos.append(fin)
+        else:
+            # Fin de bloque sin evento: las tenencias siguen a la deriva
+            tenencias = valores[-1]
+        t = fin + 1
+
+    valor = valor_activos.sum(axis=1) + valor_efectivo - costos
+    pesos_dia = valor_activos / (valor + costos)[:, np.newaxis]
+    retornos_portafolio = np.diff(valor, prepend=capital) / np.concatenate(([capital], valor[:-1]))
+    # La compra inicial ya se descontó de las tenencias; se registra para que el total de costos la incluya
+    costos[0] += costo_inicial
+
+    valor = pd.Series(valor, index=indice, name='Rebalanceo')
+    retornos_portafolio = pd.Series(retornos_portafolio, index=indice, name='Rebalanceo')
+    _, columnas = etiquetas(retornos)
+    resultado = {
+        'valor': valor,
+        'retornos': retornos_portafolio,
+        'pesos': pd.DataFrame(pesos_dia, index=indice, columns=columnas),
+        'costos': pd.Series(costos, index=indice, name='Costos'),
+        'rebalanceos': indice[rebalanceos]
+    }
+    if con_metricas:
+        resultado['metricas'] = metricas_columnas(retornos_portafolio.to_frame(), valor.to_frame(),
+                                                 tasa_libre_riesgo).iloc[0]
+    return resultado
@@ -0,0 +1,134 @@
+#Barrido de parámetros en paralelo para backtests y optimizaciones
+#
+#Uso: python barrido.py   (barre frecuencias, umbrales, costos y portafolios de portfolio_config.py)
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest import backtest_rebalanceo
+from optimizador import max_sharpe
+from portfolio_config import nombres_portafolios, pesos_list
+from simulacion import estadisticos_anuales
+from tbill import resolver_tasa, resolver_tasa_anual
+
+# Estado de cada proceso: la matriz de retornos vive en memoria compartida
+_retornos = None
+_memoria = None
+
+def _iniciar_proceso(nombre_memoria, forma, dtype, indice, columnas):
+    """Adjunta la memoria compartida y arma un DataFrame sin copiar los datos"""
+    global _retornos, _memoria
+    _memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    matriz = np.ndarray(forma, dtype=dtype, buffer=_memoria.buf)
+    _retornos = pd.DataFrame(matriz, index=indice, columns=columnas, copy=False)
+
+def _ejecutar(funcion, configuracion, retornos=None):
+    inicio = time.perf_counter()
+    resultado = funcion(_retornos if retornos is None else retornos, **configuracion)
+    return resultado, time.perf_counter() - inicio, os.getpid()
+
+def malla_parametros(**parametros):
+    """Producto cartesiano de listas de valores: malla_parametros(a=[1, 2], b=['x']) -> [{'a': 1, 'b': 'x'}, ...]"""
+    nombres = list(parametros)
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*parametros.values())]
+
+def ejecutar_barrido(retornos, funcion, configuraciones, procesos=None):
+    """Ejecuta funcion(retornos, **configuracion) para cada configuración en un pool de procesos.
+
+    La matriz de retornos se copia una sola vez a memoria compartida y cada
+    proceso la lee sin duplicarla; con procesos=1 las tareas corren en este
+    proceso sobre el DataFrame original, sin memoria compartida. 'funcion' debe
+    estar definida a nivel de módulo y regresar un diccionario de escalares.
+    Regresa una tabla con una fila por configuración: parámetros, resultados,
+    segundos de la tarea y proceso.
+    """
+    procesos = procesos or os.cpu_count()
+    inicio = time.perf_counter()
+    if procesos == 1:
+        salidas = [_ejecutar(funcion, c, retornos) for c in configuraciones]
+    else:
+        matriz = np.ascontiguousarray(retornos.to_numpy(dtype=float))
+        memoria = shared_memory.SharedMemory(create=True, size=max(matriz.nbytes, 1))
+        try:
+            np.ndarray(matriz.shape, dtype=matriz.dtype, buffer=memoria.buf)[:] = matriz
+            argumentos = (memoria.name, matriz.shape, matriz.dtype, retornos.index, retornos.columns)
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso,
+                                     initargs=argumentos) as pool:
+                futuros = [pool.submit(_ejecutar, funcion, c) for c in configuraciones]
+                salidas = [f.result() for f in futuros]
+        finally:
+            memoria.close()
+            memoria.unlink()
+
+    filas = []
+    for configuracion, (resultado, segundos, pid) in zip(configuraciones, salidas):
+        filas.append({**configuracion, **resultado, 'segundos': segundos, 'proceso': pid})
+    tabla = pd.DataFrame(filas)
+    tabla.attrs['tiempo_total'] = time.perf_counter() - inicio
+    tabla.attrs['tiempo_tareas'] = tabla['segundos'].sum() if len(tabla) else 0.0
+    return tabla
+
+# Tareas listas para usarse en un barrido
+
+def tarea_backtest(retornos, portafolio, frecuencia='mensual', umbral=None,
+                   costo_proporcional=0.0, costo_fijo=0.0, ventana=None, tasa_libre_riesgo=None):
+    """Backtest con rebalanceo de uno de los portafolios de portfolio_config.py (sin tasa, la del T-bill)"""
+    pesos = pesos_list[nombres_portafolios.index(portafolio)]
+    if ventana is not None:
+        retornos = retornos.iloc[-ventana:]
+    resultado = backtest_rebalanceo(retornos, pesos, frecuencia, umbral,
+                                    costo_proporcional, costo_fijo, con_metricas=False)
+    r = resultado['retornos']
+    tasa_libre_riesgo = resolver_tasa(tasa_libre_riesgo, r.index)
+    rendimiento_anual = r.mean() * 252
+    exceso_anual = (r - tasa_libre_riesgo).mean() * 252
+    volatilidad_anual = r.std() * np.sqrt(252)
+    valor = resultado['valor'].to_numpy()
+    return {
+        'Rendimiento Anual (%)': rendimiento_anual * 100,
+        'Volatilidad Anual (%)': volatilidad_anual * 100,
+        'Sharpe Ratio': exceso_anual / volatilidad_anual,
+        'Máximo Drawdown (%)': (valor / np.maximum.accumulate(valor) - 1).min() * 100,
+        'Rebalanceos': len(resultado['rebalanceos']),
+        'Costos': resultado['costos'].sum()
+    }
+
+def tarea_optimizacion(retornos, ventana=None, tasa_libre_riesgo=None):
+    """Portafolio de máximo Sharpe estimado con los últimos 'ventana' días (sin tasa, el T-bill promedio de la ventana)"""
+    if ventana is not None:
+        retornos = retornos.iloc[-ventana:]
+    tasa_libre_riesgo = resolver_tasa_anual(tasa_libre_riesgo, retornos.index)
+    mu, cov = estadisticos_anuales(retornos)
+    optimo = max_sharpe(mu, cov, tasa_libre_riesgo)
+    resultado = {'Rendimiento': optimo['rendimiento'], 'Volatilidad': optimo['volatilidad'],
+                 'Sharpe Ratio': optimo['sharpe']}
+    resultado.update({f"Peso {c}": p for c, p in zip(retornos.columns, optimo['pesos'])})
+    return resultado
+
+def main():
+    from price_store import obtener_precios
+    from portfolio_config import simbolos
+
+    precios = obtener_precios(simbolos, '2010-01-01').ffill().dropna()
+    retornos = precios.pct_change().dropna()
+
+    configuraciones = malla_parametros(
+        portafolio=nombres_portafolios,
+        frecuencia=['mensual', 'trimestral', 'anual', None],
+        umbral=[None, 0.05, 0.10],
+        costo_proporcional=[0.0, 0.001, 0.0025],
+        ventana=[None, 252 * 3]
+    )
+    tabla = ejecutar_barrido(retornos, tarea_backtest, configuraciones)
+    print(tabla.sort_values('Sharpe Ratio', ascending=False).head(20).to_string())
+    print(f"{len(tabla)} tareas en {tabla.attrs['tiempo_total']:.2f} s "
+          f"({tabla.attrs['tiempo_tareas']:.2f} s de cómputo en {tabla['proceso'].nunique()} procesos)")
+
+if __name__ == "__main__":
+    main()
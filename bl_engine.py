@@ -0,0 +1,132 @@
+#Motor de Black-Litterman por lotes: muchos escenarios de views sobre un mismo prior
+#
+#Uso: python bl_engine.py   (estrés de los views de bl.py con cientos de intervalos)
+
+import numpy as np
+import pandas as pd
+
+def aversion_implicita(precios_mercado, tasa_libre_riesgo=0.02, periodos=252):
+    """Aversión al riesgo implícita del mercado: (rendimiento - rf) / varianza, anualizados"""
+    retornos = pd.Series(np.asarray(precios_mercado, dtype=float).ravel()).pct_change().dropna()
+    return (retornos.mean() * periodos - tasa_libre_riesgo) / (retornos.var() * periodos)
+
+def prior_implicito(cov, pesos_mercado, aversion, tasa_libre_riesgo=0.0):
+    """Rendimientos de equilibrio pi = delta · cov · w_mercado + rf"""
+    pesos_mercado = np.asarray(pesos_mercado, dtype=float)
+    return aversion * np.asarray(cov, dtype=float) @ (pesos_mercado / pesos_mercado.sum()) + tasa_libre_riesgo
+
+def vistas_absolutas(vistas, activos):
+    """Matrices P (K x N) y Q (K) de un diccionario de views absolutos {activo: rendimiento}"""
+    activos = list(activos)
+    P = np.zeros((len(vistas), len(activos)))
+    for k, activo in enumerate(vistas):
+        P[k, activos.index(activo)] = 1.0
+    return P, np.array(list(vistas.values()), dtype=float)
+
+def omega_desde_intervalos(intervalos):
+    """Omega diagonal a partir de intervalos de confianza (..., K, 2): varianza ((sup - inf) / 2)²"""
+    intervalos = np.asarray(intervalos, dtype=float)
+    sigma = (intervalos[..., 1] - intervalos[..., 0]) / 2
+    return (sigma ** 2)[..., np.newaxis] * np.eye(sigma.shape[-1])
+
+class MotorBlackLitterman:
+    """Posteriores de Black-Litterman para lotes de escenarios (P, Q, Omega).
+
+    El prior (pi), la covarianza y tau·Σ se calculan una sola vez. Cada escenario
+    sólo necesita resolver el sistema K x K de sus views con la forma
+    mu = pi + tau·Σ·P' (P·tau·Σ·P' + Omega)^-1 (Q - P·pi), que no invierte tau·Σ;
+    todos los escenarios con el mismo número de views se resuelven juntos.
+    """
+
+    def __init__(self, cov, pi, tau=0.05):
+        self.activos = list(cov.columns) if isinstance(cov, pd.DataFrame) else None
+        self.cov = np.asarray(cov, dtype=float)
+        self.pi = np.asarray(pi, dtype=float)
+        self.tau = tau
+        self.tau_cov = tau * self.cov
+
+    def omega_por_defecto(self, P):
+        """Omega proporcional a la varianza de cada view: tau · diag(P Σ P')"""
+        varianzas = np.einsum('...kn,nm,...km->...k', P, self.tau_cov, P)
+        return varianzas[..., np.newaxis] * np.eye(varianzas.shape[-1])
+
+    def posterior(self, P, Q, omega=None, con_covarianza=True):
+        """Rendimientos (B x N) y covarianzas (B x N x N) posteriores del lote.
+
+        P: (B x K x N) o (K x N) compartida por todos los escenarios; Q: (B x K);
+        omega: (B x K x K), (K x K) o None (omega_por_defecto). La covarianza
+        posterior es Σ + tau·Σ - tau·Σ·P' (P·tau·Σ·P' + Omega)^-1 P·tau·Σ, como
+        la de pypfopt.
+        """
+        Q = np.atleast_2d(np.asarray(Q, dtype=float))
+        B, K = Q.shape
+        P = np.broadcast_to(np.asarray(P, dtype=float), (B, K, len(self.pi)))
+        omega = self.omega_por_defecto(P) if omega is None else np.broadcast_to(omega, (B, K, K))
+
+        P_tau_cov = P @ self.tau_cov
+        sistema = P_tau_cov @ P.transpose(0, 2, 1) + omega
+        sorpresa = Q - P @ self.pi
+        if not con_covarianza:
+            x = np.linalg.solve(sistema, sorpresa[..., np.newaxis])[..., 0]
+            return self.pi + np.einsum('bkn,bk->bn', P_tau_cov, x), None
+
+        # Un solo solve por escenario para la media y la covarianza
+        derecha = np.concatenate((sorpresa[..., np.newaxis], P_tau_cov), axis=2)
+        x = np.linalg.solve(sistema, derecha)
+        mu = self.pi + np.einsum('bkn,bk->bn', P_tau_cov, x[..., 0])
+        cov = self.cov + self.tau_cov - P_tau_cov.transpose(0, 2, 1) @ x[..., 1:]
+        return mu, cov
+
+    def posterior_escenarios(self, escenarios, con_covarianza=True):
+        """Posteriores de una lista de escenarios {'P', 'Q', 'omega'} con distinto número de views.
+
+        Agrupa los escenarios por número de views y resuelve cada grupo como un
+        lote. Regresa las listas de rendimientos y covarianzas en el orden original.
+        """
+        grupos = {}
+        for i, escenario in enumerate(escenarios):
+            grupos.setdefault(len(escenario['Q']), []).append(i)
+
+        mus = [None] * len(escenarios)
+        covs = [None] * len(escenarios)
+        for indices in grupos.values():
+            lote = [escenarios[i] for i in indices]
+            omegas = [e.get('omega') for e in lote]
+            omega = None if any(o is None for o in omegas) else np.stack(omegas)
+            mu, cov = self.posterior(np.stack([e['P'] for e in lote]), np.stack([e['Q'] for e in lote]),
+                                     omega, con_covarianza)
+            for j, i in enumerate(indices):
+                mus[i] = mu[j]
+                covs[i] = cov[j] if con_covarianza else None
+        return mus, covs
+
+def main():
+    import time
+    from price_store import obtener_precios
+    from covarianza import obtener_covarianza
+    from tbill import tasa_anual_promedio
+
+    activos = ['EMB', 'XLE', 'SPXL', 'EEM', 'SHV']
+    precios = obtener_precios(activos, "2010-01-01", campo="Adj Close")[activos].ffill().dropna()
+    cov = obtener_covarianza(precios.pct_change().dropna(), "ledoit_wolf").to_numpy()
+    tasa_rf = tasa_anual_promedio(precios.index[0], precios.index[-1])
+    delta = aversion_implicita(obtener_precios("SPY", "2010-01-01", campo="Adj Close"), tasa_rf)
+    motor = MotorBlackLitterman(cov, prior_implicito(cov, np.ones(len(activos)), delta))
+
+    # Views e intervalos de bl.py, con los intervalos escalados de 0.25x a 4x
+    P, Q = vistas_absolutas({'EMB': 0.01, 'XLE': 0.15, 'SPXL': 0.55, 'EEM': 0.10, 'SHV': 0.02}, activos)
+    intervalos = np.array([(0.1, 0.35), (0.35, 0.65), (0.5, 0.8), (0.2, 0.5), (0.2, 0.4)])
+    escalas = np.geomspace(0.25, 4, 500)
+    centros = intervalos.mean(axis=1)
+    anchos = (intervalos[:, 1] - intervalos[:, 0]) / 2
+    lote_intervalos = np.stack([centros - escalas[:, None] * anchos, centros + escalas[:, None] * anchos], axis=-1)
+
+    inicio = time.perf_counter()
+    mu, _ = motor.posterior(P, np.tile(Q, (len(escalas), 1)), omega_desde_intervalos(lote_intervalos))
+    segundos = time.perf_counter() - inicio
+    tabla = pd.DataFrame(mu, index=pd.Index(escalas.round(3), name='escala'), columns=activos)
+    print(tabla.iloc[::50].round(4).to_string())
+    print(f"{len(escalas)} escenarios en {1000 * segundos:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#Modelo de Black-Litterman de bl.py sin Streamlit: prior -> posterior -> pesos
+#
+#Uso: python bl_pipeline.py   (corre el modelo con los views de la página e imprime los resultados)
+
+import numpy as np
+import pandas as pd
+
+from bl_engine import (MotorBlackLitterman, aversion_implicita, omega_desde_intervalos,
+                       prior_implicito, vistas_absolutas)
+from covarianza import obtener_covarianza
+from optimizador import max_sharpe
+
+ACTIVOS = ['EMB', 'XLE', 'SPXL', 'EEM', 'SHV']
+INICIO = "2010-01-01"
+
+# Views absolutos a un año y sus intervalos de confianza (en el orden de VISTAS)
+VISTAS = {'EMB': 0.01, 'XLE': 0.15, 'SPXL': 0.55, 'EEM': 0.10, 'SHV': 0.02}
+INTERVALOS = [(0.1, 0.35), (0.35, 0.65), (0.5, 0.8), (0.2, 0.5), (0.2, 0.4)]
+
+# Penalización L2 del portafolio (la gamma por omisión de L2_reg en PyPortfolioOpt)
+GAMMA_L2 = 1.0
+
+def capitalizaciones(activos):
+    """Capitalización aproximada (último cierre x totalAssets); 0 si faltan datos"""
+    from metadata import obtener_info
+
+    capitalizacion = {}
+    for activo, info in obtener_info(list(activos)).items():
+        precio_cierre = info.get("ultimo_cierre")
+        total_activos = info.get("totalAssets")
+        if precio_cierre is not None and total_activos is not None:
+            capitalizacion[activo] = precio_cierre * total_activos
+        else:
+            capitalizacion[activo] = 0.0
+    return pd.Series(capitalizacion, dtype=float)
+
+def black_litterman(precios, precios_mercado, capitalizacion, vistas=VISTAS, intervalos=INTERVALOS,
+                    tau=0.05, tasa_libre_riesgo=None, gamma=GAMMA_L2):
+    """Prior de mercado, posterior con los views y portafolio de máximo Sharpe.
+
+    precios: DataFrame de precios de los activos; precios_mercado: serie del
+    índice de mercado (SPY) para la aversión al riesgo; capitalizacion: Series
+    por activo (si ninguna es positiva el prior usa pesos iguales). Sin tasa
+    libre de riesgo se usa el promedio del T-bill en el periodo de los precios;
+    gamma es la penalización L2 del máximo Sharpe (0 la quita).
+    Regresa un diccionario de Series y DataFrames indexados por activo.
+    """
+    activos = list(precios.columns)
+    if tasa_libre_riesgo is None:
+        from tbill import tasa_anual_promedio
+        tasa_libre_riesgo = tasa_anual_promedio(precios.index[0], precios.index[-1])
+
+    cov = obtener_covarianza(precios.pct_change().dropna(how="all").fillna(0), "ledoit_wolf")
+    delta = aversion_implicita(precios_mercado, tasa_libre_riesgo)
+    pesos_mercado = capitalizacion.reindex(activos).fillna(0).clip(lower=0).to_numpy()
+    if pesos_mercado.sum() <= 0:
+        pesos_mercado = np.ones(len(activos))
+    pi = prior_implicito(cov, pesos_mercado, delta)
+
+    motor = MotorBlackLitterman(cov, pi, tau)
+    P, Q = vistas_absolutas(vistas, activos)
+    mu, cov_bl = motor.posterior(P, Q, omega_desde_intervalos(intervalos))
+    optimo = max_sharpe(mu[0], cov_bl[0], tasa_libre_riesgo, gamma=gamma)
+
+    desviacion = np.sqrt(np.diag(cov.to_numpy()))
+    return {
+        'covarianza': cov,
+        'correlacion': cov / np.outer(desviacion, desviacion),
+        'aversion': delta,
+        'tasa_libre_riesgo': tasa_libre_riesgo,
+        'prior': pd.Series(pi, index=activos, name='Prior'),
+        'posterior': pd.Series(mu[0], index=activos, name='Posterior'),
+        'vistas': pd.Series(vistas, name='Views').reindex(activos),
+        'covarianza_posterior': pd.DataFrame(cov_bl[0], index=activos, columns=activos),
+        'pesos': pd.Series(optimo['pesos'], index=activos, name='Pesos'),
+        'rendimiento': optimo['rendimiento'],
+        'volatilidad': optimo['volatilidad'],
+        'sharpe': optimo['sharpe']
+    }
+
+def main():
+    from price_store import obtener_precios
+
+    precios = obtener_precios(ACTIVOS, INICIO, campo="Adj Close")
+    mercado = obtener_precios("SPY", INICIO, campo="Adj Close")
+    resultado = black_litterman(precios, mercado, capitalizaciones(precios.columns))
+    tabla = pd.concat([resultado['prior'], resultado['vistas'], resultado['posterior'], resultado['pesos']], axis=1)
+    print(tabla.round(4).to_string())
+    print(f"Rendimiento esperado: {resultado['rendimiento']:.2%}  Volatilidad: {resultado['volatilidad']:.2%}"
+          f"  Sharpe: {resultado['sharpe']:.2f}  (rf {resultado['tasa_libre_riesgo']:.2%}, delta {resultado['aversion']:.2f})")
+
+if __name__ == "__main__":
+    main()
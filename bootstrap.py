@@ -0,0 +1,109 @@
+#Intervalos de confianza por bootstrap de bloques para las métricas de un portafolio
+
+import numpy as np
+import pandas as pd
+
+from drawdown import calcular_drawdown
+from metricas import estadisticas_columnas
+from panel import etiquetas
+from tbill import resolver_tasa
+
+ESQUEMAS = ['estacionario', 'circular']
+
+def indices_bootstrap(T, n_muestras, tam_bloque, esquema='estacionario', semilla=None):
+    """Matriz (n_muestras x T) de índices remuestreados por bloques.
+
+    'circular': bloques de longitud fija que dan la vuelta al final de la serie.
+    'estacionario' (Politis-Romano): bloques de longitud geométrica con media
+    tam_bloque. Sólo se generan índices; la serie nunca se copia por bloque.
+    'semilla' puede ser un entero o un np.random.Generator ya creado.
+    """
+    rng = np.random.default_rng(semilla)
+    if esquema == 'circular':
+        n_bloques = -(-T // tam_bloque)
+        inicios = rng.integers(0, T, size=(n_muestras, n_bloques, 1))
+        indices = (inicios + np.arange(tam_bloque)) % T
+        return indices.reshape(n_muestras, -1)[:, :T]
+    if esquema != 'estacionario':
+        raise ValueError(f"Esquema desconocido: {esquema}")
+
+    # Cada posición empieza un bloque nuevo con probabilidad 1/tam_bloque; si no,
+    # continúa el bloque anterior un día después
+    nuevo = rng.random((n_muestras, T)) < 1 / tam_bloque
+    nuevo[:, 0] = True
+    posiciones = np.arange(T)
+    ultimo_inicio = np.maximum.accumulate(np.where(nuevo, posiciones, 0), axis=1)
+    inicio_bloque = np.zeros((n_muestras, T), dtype=np.int64)
+    inicio_bloque[nuevo] = rng.integers(0, T, size=nuevo.sum())
+    inicio_bloque = np.take_along_axis(inicio_bloque, ultimo_inicio, axis=1)
+    return (inicio_bloque + posiciones - ultimo_inicio) % T
+
+def _metricas_muestras(r, tasa_libre_riesgo):
+    """Métricas numéricas de calcular_metricas_portafolio para cada columna de r (T x B).
+
+    tasa_libre_riesgo es la tasa diaria promedio de cada muestra (escalar o arreglo de B).
+    """
+    e = estadisticas_columnas(r)
+    rendimiento_anual = e['media'] * 252
+    exceso_anual = (e['media'] - tasa_libre_riesgo) * 252
+    volatilidad_anual = e['volatilidad'] * np.sqrt(252)
+    drawdown, _ = calcular_drawdown(np.cumprod(1 + r, axis=0))
+    return {
+        'Rendimiento Anual (%)': rendimiento_anual * 100,
+        'Rendimiento Acumulado (%)': (np.prod(1 + r, axis=0) - 1) * 100,
+        'Volatilidad Anual (%)': volatilidad_anual * 100,
+        'Sharpe Ratio': exceso_anual / volatilidad_anual,
+        'Sortino Ratio': exceso_anual / e['volatilidad_negativa'],
+        'Sesgo': e['sesgo'],
+        'Curtosis': e['curtosis'],
+        'VaR 95%': e['var'],
+        'CVaR 95%': e['cvar'],
+        'Máximo Drawdown (%)': np.minimum(drawdown.min(axis=0), 0) * 100
+    }
+
+def intervalos_confianza(retornos, n_muestras=2000, tam_bloque=None, esquema='estacionario',
+                         nivel=0.95, tasa_libre_riesgo=None, semilla=None, bloque_muestras=500):
+    """Intervalos de confianza por bootstrap de bloques de las métricas de un portafolio.
+
+    Remuestrea la serie de retornos n_muestras veces con bloques (por defecto de
+    longitud T^(1/3)) para conservar la autocorrelación y evalúa todas las
+    muestras a la vez como columnas de una matriz, en grupos de bloque_muestras.
+    Las fechas y duraciones del drawdown no tienen equivalente en una serie
+    remuestreada y se omiten. Regresa una tabla con la estimación, los límites
+    del intervalo por percentiles y el error estándar de cada métrica.
+    La tasa libre de riesgo diaria puede ser un escalar o una serie alineada con
+    los retornos; una serie se remuestrea con los mismos índices. Sin tasa se
+    usa el T-bill vigente en cada fecha de los retornos.
+    """
+    tasa_libre_riesgo = resolver_tasa(tasa_libre_riesgo, etiquetas(retornos)[0])
+    r = np.asarray(retornos, dtype=float)
+    tasa = np.broadcast_to(np.asarray(tasa_libre_riesgo, dtype=float), r.shape)
+    tasa = tasa[~np.isnan(r)]
+    r = r[~np.isnan(r)]
+    T = len(r)
+    tam_bloque = tam_bloque or max(int(round(T ** (1 / 3))), 1)
+    rng = np.random.default_rng(semilla)
+
+    # Los índices se generan por grupos para que la memoria no crezca con n_muestras
+    muestras = {}
+    for inicio in range(0, n_muestras, bloque_muestras):
+        indices = indices_bootstrap(T, min(bloque_muestras, n_muestras - inicio), tam_bloque, esquema, rng)
+        parcial = _metricas_muestras(r[indices.T], tasa[indices].mean(axis=1))
+        for nombre, valores in parcial.items():
+            muestras.setdefault(nombre, []).append(valores)
+    estimacion = _metricas_muestras(r[:, np.newaxis], tasa.mean())
+
+    cola = (1 - nivel) / 2 * 100
+    filas = {}
+    for nombre, partes in muestras.items():
+        valores = np.concatenate(partes)
+        inferior, superior = np.nanpercentile(valores, [cola, 100 - cola])
+        filas[nombre] = {
+            'Estimación': estimacion[nombre][0],
+            'Inferior': inferior,
+            'Superior': superior,
+            'Error Estándar': np.nanstd(valores, ddof=1)
+        }
+    tabla = pd.DataFrame(filas).T
+    tabla.attrs.update({'muestras': n_muestras, 'tam_bloque': tam_bloque, 'esquema': esquema, 'nivel': nivel})
+    return tabla
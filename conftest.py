@@ -0,0 +1,3 @@
+#Pruebas con pytest: la raíz del repositorio va en sys.path para importar los módulos planos
+#
+#Uso: python -m pytest -q
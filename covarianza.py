@@ -0,0 +1,188 @@
+#Servicio de covarianzas compartido: muestral, Ledoit-Wolf, OAS y EWMA con memoria LRU
+#
+#Todas las páginas y optimizadores piden la covarianza aquí, así que una misma
+#estimación (mismos datos, método y ventana) se calcula una sola vez por proceso.
+
+import numpy as np
+import pandas as pd
+
+from memoria import CacheLRU, huella
+from panel import PanelRetornos
+
+METODOS = ['muestral', 'ledoit_wolf', 'oas', 'ewma']
+
+class MomentosMoviles:
+    """Sumas suficientes de una ventana de retornos para la media y las covarianzas.
+
+    Agregar o quitar un bloque de filas cuesta O(filas · N²), así que mover la
+    ventana no recalcula toda la historia. Además de las sumas de primer y
+    segundo orden guarda sum(|x|⁴) y sum(|x|² x), con las que el término de
+    cuarto orden de Ledoit-Wolf también se actualiza sin recorrer la ventana.
+    """
+
+    def __init__(self, n_activos):
+        self.n = 0
+        self.suma = np.zeros(n_activos)
+        self.suma_productos = np.zeros((n_activos, n_activos))
+        self.suma_normas2 = 0.0
+        self.suma_normas_x = np.zeros(n_activos)
+
+    def _sumas(self, bloque):
+        normas = np.einsum('ij,ij->i', bloque, bloque)
+        return bloque.sum(axis=0), bloque.T @ bloque, normas @ normas, normas @ bloque
+
+    def agregar(self, bloque):
+        suma, productos, normas2, normas_x = self._sumas(bloque)
+        self.n += len(bloque)
+        self.suma += suma
+        self.suma_productos += productos
+        self.suma_normas2 += normas2
+        self.suma_normas_x += normas_x
+
+    def quitar(self, bloque):
+        suma, productos, normas2, normas_x = self._sumas(bloque)
+        self.n -= len(bloque)
+        self.suma -= suma
+        self.suma_productos -= productos
+        self.suma_normas2 -= normas2
+        self.suma_normas_x -= normas_x
+
+    def covarianza(self, metodo='muestral'):
+        """Covarianza diaria de la ventana: 'muestral', 'ledoit_wolf' u 'oas'"""
+        n = self.n
+        media = self.suma / n
+        centrada = self.suma_productos - n * np.outer(media, media)
+        if metodo == 'muestral':
+            return centrada / (n - 1)
+        if metodo == 'ledoit_wolf':
+            return _ledoit_wolf(centrada, n, self._cuarto_momento(media))
+        if metodo == 'oas':
+            return _oas(centrada / n, n)
+        raise ValueError(f"Método sin actualización incremental: {metodo}")
+
+    def _cuarto_momento(self, media):
+        """sum_t |x_t - media|⁴ a partir de las sumas de la ventana"""
+        c = media @ media
+        return (self.suma_normas2 + 4 * media @ self.suma_productos @ media + self.n * c * c
+                - 4 * media @ self.suma_normas_x + 2 * c * np.trace(self.suma_productos)
+                - 4 * c * media @ self.suma)
+
+    def estadisticos(self, periodos=252, metodo='muestral'):
+        """Media y covarianza anualizadas de la ventana actual"""
+        return self.suma / self.n * periodos, self.covarianza(metodo) * periodos
+
+def _ledoit_wolf(centrada, n, cuarto_momento):
+    """Encogimiento de Ledoit-Wolf hacia mu·I (mismo estimador que sklearn y pypfopt)"""
+    p = centrada.shape[0]
+    empirica = centrada / n
+    traza = np.trace(empirica)
+    mu = traza / p
+    delta_ = np.sum(centrada ** 2) / n ** 2
+    beta = (cuarto_momento / n - delta_) / (p * n)
+    delta = (delta_ - 2 * mu * traza + p * mu ** 2) / p
+    encogimiento = 0.0 if beta == 0 else min(beta, delta) / delta
+    return (1 - encogimiento) * empirica + encogimiento * mu * np.eye(p)
+
+def _oas(empirica, n):
+    """Encogimiento Oracle Approximating Shrinkage hacia mu·I (como sklearn)"""
+    p = empirica.shape[0]
+    mu = np.trace(empirica) / p
+    alpha = np.mean(empirica ** 2)
+    denominador = (n + 1) * (alpha - mu ** 2 / p)
+    encogimiento = 1.0 if denominador == 0 else min((alpha + mu ** 2) / denominador, 1.0)
+    return (1 - encogimiento) * empirica + encogimiento * mu * np.eye(p)
+
+def _ewma(x, span):
+    """Covarianza con pesos exponenciales de las desviaciones a la media (como pypfopt.exp_cov)"""
+    d = x - x.mean(axis=0)
+    pesos = (1 - 2 / (span + 1)) ** np.arange(len(x))[::-1]
+    return (d * pesos[:, np.newaxis]).T @ d / pesos.sum()
+
+def estimar_covarianza(retornos, metodo='muestral', periodos=252, span=180):
+    """Covarianza anualizada de una matriz de retornos (sin memoria)"""
+    if metodo == 'muestral':
+        # pandas conserva el manejo por pares de los NaN de DataFrame.cov()
+        return pd.DataFrame(np.asarray(retornos, dtype=float)).cov().to_numpy() * periodos
+    x = np.nan_to_num(np.asarray(retornos, dtype=float))
+    if metodo == 'ewma':
+        return _ewma(x, span) * periodos
+    momentos = MomentosMoviles(x.shape[1])
+    momentos.agregar(x)
+    return momentos.covarianza(metodo) * periodos
+
+class ServicioCovarianza(CacheLRU):
+    """Covarianzas memorizadas por huella de los datos, método, ventana y anualización.
+
+    Es una CacheLRU de memoria.py: guarda hasta max_entradas resultados, descarta
+    el menos usado y es segura entre hilos (las sesiones de Streamlit comparten
+    el proceso).
+    """
+
+    def __init__(self, max_entradas=64):
+        super().__init__(max_entradas)
+
+    def covarianza(self, retornos, metodo='muestral', ventana=None, periodos=252, span=180):
+        """Covarianza anualizada de los últimos 'ventana' días (todos si es None).
+
+        Regresa un DataFrame con los activos como índice y columnas si 'retornos'
+        es un DataFrame o un PanelRetornos, y un arreglo en otro caso; siempre es una copia.
+        """
+        if metodo not in METODOS:
+            raise ValueError(f"Método desconocido: {metodo}")
+        if isinstance(retornos, PanelRetornos):
+            retornos = retornos.marco()
+        datos = retornos
+        if ventana:
+            datos = retornos.iloc[-ventana:] if isinstance(retornos, pd.DataFrame) else np.asarray(retornos)[-ventana:]
+        clave = ('covarianza', huella(datos), metodo, periodos, span if metodo == 'ewma' else None)
+        cov = self.obtener(clave, lambda: estimar_covarianza(datos, metodo, periodos, span))
+        if isinstance(retornos, pd.DataFrame):
+            return pd.DataFrame(cov, index=retornos.columns, columns=retornos.columns, copy=True)
+        return cov.copy()
+
+    def moviles(self, retornos, ventana, paso=21, metodo='muestral', periodos=252, span=180):
+        """Covarianzas anualizadas en ventanas móviles cada 'paso' días.
+
+        Con 'muestral', 'ledoit_wolf' y 'oas' la ventana se desliza agregando y
+        quitando filas de MomentosMoviles; 'ewma' se estima en cada ventana.
+        Regresa las posiciones del último día de cada ventana y un arreglo (K x N x N).
+        """
+        x = np.asarray(retornos, dtype=float)
+        clave = ('moviles', huella(x), metodo, ventana, paso, periodos, span if metodo == 'ewma' else None)
+
+        def construir():
+            fines = np.arange(ventana, len(x) + 1, paso)
+            covs = np.empty((len(fines), x.shape[1], x.shape[1]))
+            if metodo == 'ewma':
+                for i, fin in enumerate(fines):
+                    covs[i] = _ewma(x[fin - ventana:fin], span) * periodos
+                return fines - 1, covs
+            datos = np.nan_to_num(x)
+            momentos = MomentosMoviles(x.shape[1])
+            momentos.agregar(datos[:ventana])
+            for i, fin in enumerate(fines):
+                if i > 0:
+                    momentos.agregar(datos[fines[i - 1]:fin])
+                    momentos.quitar(datos[fines[i - 1] - ventana:fin - ventana])
+                covs[i] = momentos.covarianza(metodo) * periodos
+            return fines - 1, covs
+
+        posiciones, covs = self.obtener(clave, construir)
+        return posiciones.copy(), covs.copy()
+
+_servicio = None
+
+def configurar_servicio(max_entradas=64):
+    """Reemplaza el servicio global (p. ej. para cambiar el tamaño de la memoria)"""
+    global _servicio
+    _servicio = ServicioCovarianza(max_entradas)
+    return _servicio
+
+def servicio():
+    global _servicio
+    if _servicio is None:
+        _servicio = ServicioCovarianza()
+    return _servicio
+
+def obtener_covarianza(retornos, metodo='muestral', ventana=None, periodos=252, span=180):
+    return servicio().covarianza(retornos, metodo, ventana, periodos, span)
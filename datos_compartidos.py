@@ -0,0 +1,66 @@
+#Datos y cálculos compartidos por todas las páginas de la app (Proyecto.py)
+#
+#Las páginas de Streamlit se vuelven a ejecutar en cada interacción y al navegar
+#entre ellas; lo que piden aquí (precios, artefactos, covarianzas, tablas de
+#métricas) se calcula o se lee de disco una sola vez por proceso y después se
+#sirve desde memoria a cualquier página y sesión. Las covarianzas ya se
+#memorizan en covarianza.py (obtener_covarianza, estadisticos_anuales).
+
+from datetime import date
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+import artifacts
+from backtest import backtest_rebalanceo
+from memoria import CacheLRU, huella
+from price_store import obtener_precios
+
+def _copia(obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)):
+        return obj.copy()
+    if isinstance(obj, dict):
+        return {k: _copia(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return tuple(_copia(v) for v in obj)
+    return obj
+
+# Copias de DataFrames, Series y arreglos para que una página no pueda modificar lo que ven las demás
+_cache = CacheLRU(max_entradas=128, copiar=_copia)
+
+def cache():
+    return _cache
+
+def compartido(funcion):
+    """Decorador: memoriza los resultados de 'funcion' en la caché del proceso"""
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        argumentos = [*args, *(x for k in sorted(kwargs) for x in (k, kwargs[k]))]
+        clave = (funcion.__module__, funcion.__qualname__, huella(*argumentos))
+        return _cache.obtener(clave, lambda: funcion(*args, **kwargs))
+    return envoltura
+
+@compartido
+def _precios(tickers, inicio, fin, campo, dia):
+    return obtener_precios(tickers if isinstance(tickers, str) else list(tickers), inicio, fin, campo)
+
+def precios(tickers, inicio, fin=None, campo="Close"):
+    """Precios como obtener_precios; sin fecha final se vuelven a pedir al cambiar el día"""
+    tickers = tickers if isinstance(tickers, str) else tuple(tickers)
+    return _precios(tickers, str(inicio), None if fin is None else str(fin), campo,
+                    date.today().isoformat() if fin is None else None)
+
+# Artefactos de las páginas (sin volver a leer el pickle en cada ejecución)
+metricas_etfs = compartido(artifacts.artefacto_metricas_etfs)
+metricas_moviles = compartido(artifacts.artefacto_metricas_moviles)
+riesgo_cola = compartido(artifacts.artefacto_riesgo_cola)
+drawdowns = compartido(artifacts.artefacto_drawdowns)
+backtest = compartido(artifacts.artefacto_backtest)
+intervalos_confianza = compartido(artifacts.artefacto_intervalos_confianza)
+var_montecarlo = compartido(artifacts.artefacto_var_montecarlo)
+simulacion = compartido(artifacts.artefacto_simulacion)
+black_litterman = compartido(artifacts.artefacto_black_litterman)
+
+# Backtests con rebalanceo (uno por combinación de parámetros elegida en la página)
+rebalanceo = compartido(backtest_rebalanceo)
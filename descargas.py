@@ -0,0 +1,105 @@
+#Descargas concurrentes de precios con reintentos, entregando cada serie en cuanto llega
+
+import asyncio
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from price_store import almacen
+
+class FetcherInestable:
+    """Envuelve un fetcher (p. ej. CsvFetcher) para simular la red en pruebas.
+
+    Cada consulta tarda 'latencia' segundos (un número o un diccionario por
+    ticker) y las primeras 'fallas' consultas de cada ticker lanzan
+    ConnectionError; 'llamadas' cuenta las consultas por ticker.
+    """
+
+    def __init__(self, fetcher, latencia=0.0, fallas=0):
+        self.fetcher = fetcher
+        self.latencia = latencia
+        self.fallas = fallas
+        self.llamadas = {}
+        self._candado = threading.Lock()
+
+    def __call__(self, ticker, start, end, campo="Close"):
+        with self._candado:
+            self.llamadas[ticker] = self.llamadas.get(ticker, 0) + 1
+            intento = self.llamadas[ticker]
+        time.sleep(self.latencia.get(ticker, 0.0) if isinstance(self.latencia, dict) else self.latencia)
+        if intento <= self.fallas:
+            raise ConnectionError(f"Falla simulada al descargar {ticker} (intento {intento})")
+        return self.fetcher(ticker, start, end, campo)
+
+async def _con_reintentos(funcion, hilos, reintentos, espera):
+    """Ejecuta 'funcion' en el pool de hilos; si falla reintenta con espera exponencial y jitter"""
+    for intento in range(reintentos + 1):
+        try:
+            return await asyncio.get_running_loop().run_in_executor(hilos, funcion)
+        except Exception:
+            if intento == reintentos:
+                raise
+            await asyncio.sleep(espera * 2 ** intento * (0.5 + random.random()))
+
+async def descargar(tickers, start, end=None, campo="Close", max_concurrentes=8, reintentos=3, espera=0.5):
+    """Generador asíncrono de (ticker, serie, error) en el orden en que terminan las descargas.
+
+    Cada ticker pasa por el almacén de precios (sólo se descarga lo que no está
+    en disco) con a lo sumo max_concurrentes descargas a la vez. Una serie vacía
+    cuenta como falla (yf.download no lanza excepción cuando falla). Un ticker que
+    sigue fallando después de 'reintentos' reintentos llega con serie None y la
+    excepción en 'error'; los demás siguen llegando.
+    """
+    semaforo = asyncio.Semaphore(max_concurrentes)
+    hilos = ThreadPoolExecutor(max_workers=max_concurrentes)
+    precios = almacen()
+
+    def obtener(ticker):
+        serie = precios.obtener(ticker, start, end, campo)
+        if serie.empty:
+            raise LookupError(f"Descarga vacía de {ticker}")
+        return serie
+
+    async def uno(ticker):
+        async with semaforo:
+            try:
+                serie = await _con_reintentos(lambda: obtener(ticker), hilos, reintentos, espera)
+                return ticker, serie, None
+            except Exception as error:
+                return ticker, None, error
+
+    tareas = [asyncio.ensure_future(uno(t)) for t in dict.fromkeys(t.strip().upper() for t in tickers)]
+    try:
+        for siguiente in asyncio.as_completed(tareas):
+            yield await siguiente
+    finally:
+        for tarea in tareas:
+            tarea.cancel()
+        hilos.shutdown(wait=False)
+
+def iterar_descargas(tickers, start, end=None, campo="Close", max_concurrentes=8, reintentos=3, espera=0.5):
+    """Versión síncrona de descargar() para Streamlit: produce cada resultado en cuanto llega.
+
+    El ciclo de eventos corre en un hilo aparte y pasa los resultados por una
+    cola, así que la página puede actualizar su gráfica con cada serie.
+    """
+    resultados = queue.Queue()
+    fin = object()
+
+    async def producir():
+        async for resultado in descargar(tickers, start, end, campo, max_concurrentes, reintentos, espera):
+            resultados.put(resultado)
+
+    def correr():
+        try:
+            asyncio.run(producir())
+        finally:
+            resultados.put(fin)
+
+    hilo = threading.Thread(target=correr, daemon=True)
+    hilo.start()
+    while (resultado := resultados.get()) is not fin:
+        yield resultado
+    hilo.join()
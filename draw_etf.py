@@ -1,23 +1,16 @@
 #Análisis de DRAWDOWN 
 
-import yfinance as yf
-import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from datetime import datetime
+import datos_compartidos
+from drawdown import calcular_drawdown
 
 def obtener_datos_acciones(simbolos, start_date, end_date):
     """Descarga datos históricos de precios"""
-    data = yf.download(simbolos, start=start_date, end=end_date)['Close']
+    data = datos_compartidos.precios(simbolos, start_date, end_date)
     return data.ffill().dropna()
 
-def calcular_drawdown(precios):
-    """Calcula el drawdown y high water mark"""
-    high_water_mark = precios.expanding().max()
-    drawdown = (precios - high_water_mark) / high_water_mark
-    return drawdown, high_water_mark
-
 def graficar_drawdown_financiero(precios, titulo="Análisis de Drawdown"):
     """Crea gráfico de precios y drawdown en subplots"""
     drawdown, hwm = calcular_drawdown(precios)
@@ -97,32 +90,6 @@ def graficar_drawdown_financiero(precios, titulo="Análisis de Drawdown"):
 
     return fig
 
-def obtener_max_drawdown_info(precios):
-    """Obtiene información detallada del máximo drawdown"""
-    drawdown, _ = calcular_drawdown(precios)
-
-    max_drawdown = drawdown.min()
-    fecha_max_drawdown = drawdown.idxmin()
-    pico_anterior = precios[:fecha_max_drawdown].idxmax()
-
-    datos_posteriores = drawdown[fecha_max_drawdown:]
-    fechas_recuperacion = datos_posteriores[datos_posteriores >= 0]
-    fecha_recuperacion = fechas_recuperacion.index[0] if len(fechas_recuperacion) > 0 else None
-
-    duracion_caida = (fecha_max_drawdown - pico_anterior).days
-    duracion_recuperacion = (fecha_recuperacion - fecha_max_drawdown).days if fecha_recuperacion else None
-    duracion_total = (fecha_recuperacion - pico_anterior).days if fecha_recuperacion else None
-
-    return {
-        'max_drawdown': max_drawdown * 100,
-        'fecha_pico': pico_anterior,
-        'fecha_valle': fecha_max_drawdown,
-        'fecha_recuperacion': fecha_recuperacion,
-        'duracion_caida': duracion_caida,
-        'duracion_recuperacion': duracion_recuperacion,
-        'duracion_total': duracion_total
-    }
-
 # Configurar Streamlit
 st.set_page_config(page_title="Análisis de ETFs", layout="wide")
 
@@ -131,10 +98,12 @@ st.title("ETFs Drawdown Analysis")
 # Parámetros iniciales
 simbolos = ["EMB", "XLE", "SPXL", "EEM", "SHV"]
 start_date = '2010-01-01'
-end_date = datetime.now()
+end_date = None  # hasta hoy
 
 # Obtener datos
 datos = obtener_datos_acciones(simbolos, start_date, end_date)
+artefacto = datos_compartidos.drawdowns(datos)
+info_panel, top_panel = artefacto['info'], artefacto['top']
 
 # Selección del ETF
 etf_seleccionado = st.selectbox(
@@ -147,7 +116,7 @@ etf_seleccionado = st.selectbox(
 # Procesar datos del ETF seleccionado
 precios = datos[etf_seleccionado]
 fig = graficar_drawdown_financiero(precios, f'Drawdown Analyisis - {etf_seleccionado}')
-info_dd = obtener_max_drawdown_info(precios)
+info_dd = info_panel[etf_seleccionado]
 
 # Mostrar gráficos y análisis
 st.plotly_chart(fig, use_container_width=True)
@@ -163,4 +132,7 @@ if info_dd['fecha_recuperacion']:
     st.write(f"**Recovery Lenght:** {info_dd['duracion_recuperacion']} days")
     st.write(f"**Total Lenght:** {info_dd['duracion_total']} days")
 else:
-    st.write("Asset has not recovered yet from max drawdown.")
\ No newline at end of file
+    st.write("Asset has not recovered yet from max drawdown.")
+
+st.subheader(f"Top 5 drawdowns for {etf_seleccionado}")
+st.dataframe(top_panel[top_panel['activo'] == etf_seleccionado].drop(columns='activo'))
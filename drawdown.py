@@ -0,0 +1,141 @@
+#Motor de drawdown compartido (draw_etf.py y portfolio_backtesting.py)
+
+import numpy as np
+import pandas as pd
+
+from panel import como_matriz
+
+def _como_matriz(precios):
+    valores = como_matriz(precios)
+    return valores.reshape(-1, 1) if valores.ndim == 1 else valores
+
+def calcular_drawdown(precios):
+    """Calcula el drawdown y high water mark (Series, DataFrame o arreglo)"""
+    valores = _como_matriz(precios)
+    hwm = np.fmax.accumulate(valores, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = (valores - hwm) / hwm
+
+    if isinstance(precios, pd.DataFrame):
+        return (pd.DataFrame(drawdown, index=precios.index, columns=precios.columns),
+                pd.DataFrame(hwm, index=precios.index, columns=precios.columns))
+    if isinstance(precios, pd.Series):
+        return (pd.Series(drawdown[:, 0], index=precios.index, name=precios.name),
+                pd.Series(hwm[:, 0], index=precios.index, name=precios.name))
+    if np.ndim(precios) == 1:
+        return drawdown[:, 0], hwm[:, 0]
+    return drawdown, hwm
+
+def _episodios(drawdown):
+    """Encuentra todos los episodios de una matriz (T x N) de drawdowns en una pasada.
+
+    Un episodio empieza cuando el valor cae bajo su HWM y termina en el primer punto
+    que lo recupera. Regresa arreglos con el activo, los índices de pico, valle y
+    recuperación (-1 si no se ha recuperado) y la profundidad.
+    """
+    T, N = drawdown.shape
+    bajo_agua = (drawdown < 0).T
+
+    # Cada activo es una fila con centinelas en ambos extremos para que los
+    # episodios nunca crucen de un activo a otro al aplanar
+    marco = np.zeros((N, T + 2), dtype=np.int8)
+    marco[:, 1:-1] = bajo_agua
+    cambios = np.diff(marco.ravel())
+    inicios = np.flatnonzero(cambios == 1) + 1
+    fines = np.flatnonzero(cambios == -1) + 1
+
+    activo = inicios // (T + 2)
+    t_inicio = inicios % (T + 2) - 1
+    t_fin = fines % (T + 2) - 1
+    longitudes = t_fin - t_inicio
+
+    if len(inicios) == 0:
+        vacio = np.array([], dtype=np.int64)
+        return vacio, vacio, vacio, vacio, np.array([], dtype=float)
+
+    # Valle: primer mínimo de cada episodio, con reducciones por segmento
+    valores = drawdown.T[bajo_agua]
+    episodio = np.repeat(np.arange(len(inicios)), longitudes)
+    desfases = np.concatenate(([0], np.cumsum(longitudes)[:-1]))
+    profundidad = np.minimum.reduceat(valores, desfases)
+    posiciones = np.flatnonzero(valores == profundidad[episodio])
+    _, primero = np.unique(episodio[posiciones], return_index=True)
+    valle = t_inicio + (posiciones[primero] - desfases)
+
+    recuperacion = np.where(t_fin < T, t_fin, -1)
+    return activo, t_inicio - 1, valle, recuperacion, profundidad
+
+def _duracion(indice, desde, hasta):
+    if isinstance(indice, pd.DatetimeIndex):
+        return (indice[hasta] - indice[desde]).days
+    return hasta - desde
+
+def episodios_drawdown(precios):
+    """Tabla con todos los episodios de drawdown (pico, valle, recuperación, profundidad y duraciones)"""
+    if isinstance(precios, pd.Series):
+        precios = precios.to_frame(precios.name if precios.name is not None else 0)
+    elif not isinstance(precios, pd.DataFrame):
+        precios = pd.DataFrame(_como_matriz(precios))
+    drawdown, _ = calcular_drawdown(precios.to_numpy(dtype=float))
+    activo, pico, valle, recuperacion, profundidad = _episodios(drawdown)
+
+    indice = precios.index
+    recuperado = recuperacion >= 0
+    fin = np.where(recuperado, recuperacion, 0)
+    duracion_recuperacion = np.where(recuperado, np.asarray(_duracion(indice, valle, fin)), np.nan)
+    duracion_total = np.where(recuperado, np.asarray(_duracion(indice, pico, fin)), np.nan)
+
+    return pd.DataFrame({
+        'activo': precios.columns[activo],
+        'fecha_pico': indice[pico],
+        'fecha_valle': indice[valle],
+        'fecha_recuperacion': pd.Series(indice[fin]).where(recuperado).to_numpy(),
+        'max_drawdown': profundidad * 100,
+        'duracion_caida': np.asarray(_duracion(indice, pico, valle)),
+        'duracion_recuperacion': duracion_recuperacion,
+        'duracion_total': duracion_total
+    })
+
+def top_drawdowns(precios, n=5):
+    """Los n episodios más profundos de cada activo"""
+    episodios = episodios_drawdown(precios)
+    orden = episodios.sort_values(['activo', 'max_drawdown'], kind='stable')
+    return orden.groupby('activo', sort=False).head(n).reset_index(drop=True)
+
+def tabla_max_drawdown(precios):
+    """Máximo drawdown de cada columna como tabla (una fila por activo)"""
+    if isinstance(precios, pd.Series):
+        precios = precios.to_frame(precios.name if precios.name is not None else 0)
+    peores = top_drawdowns(precios, n=1).set_index('activo').reindex(precios.columns)
+
+    # Columnas que nunca cayeron bajo su máximo
+    sin_caida = peores['fecha_pico'].isna().to_numpy()
+    if sin_caida.any():
+        inicio = precios.index[0]
+        for columna in ['fecha_pico', 'fecha_valle', 'fecha_recuperacion']:
+            peores.loc[sin_caida, columna] = inicio
+        for columna in ['max_drawdown', 'duracion_caida', 'duracion_recuperacion', 'duracion_total']:
+            peores.loc[sin_caida, columna] = 0
+    return peores
+
+def _info_desde_fila(fila):
+    recuperado = pd.notna(fila['fecha_recuperacion'])
+    return {
+        'max_drawdown': fila['max_drawdown'],
+        'fecha_pico': fila['fecha_pico'],
+        'fecha_valle': fila['fecha_valle'],
+        'fecha_recuperacion': fila['fecha_recuperacion'] if recuperado else None,
+        'duracion_caida': int(fila['duracion_caida']),
+        'duracion_recuperacion': int(fila['duracion_recuperacion']) if recuperado else None,
+        'duracion_total': int(fila['duracion_total']) if recuperado else None
+    }
+
+def obtener_max_drawdown_info(precios):
+    """Obtiene información detallada del máximo drawdown.
+
+    Con una Series regresa un diccionario; con un DataFrame regresa un diccionario
+    por columna, todo a partir de una sola llamada al motor.
+    """
+    tabla = tabla_max_drawdown(precios)
+    info = {columna: _info_desde_fila(fila) for columna, fila in zip(tabla.index, tabla.to_dict('records'))}
+    return info if isinstance(precios, pd.DataFrame) else info[tabla.index[0]]
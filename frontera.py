@@ -0,0 +1,36 @@
+#Frontera eficiente exacta sobre una malla de rendimientos objetivo
+
+import numpy as np
+from optimizador import min_varianza, min_varianza_objetivo
+
+def frontera_eficiente(mu, cov, n_puntos=200, limites=(0, None), rendimiento_max=None):
+    """Traza la frontera eficiente con n_puntos rendimientos objetivo.
+
+    Empieza en el portafolio de mínima varianza y cada punto arranca desde el
+    conjunto activo del anterior. Regresa un arreglo (n_puntos, 2 + N) con las
+    columnas [volatilidad, rendimiento, pesos...], listo para np.save o para
+    graficarse encima de la simulación.
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+
+    inicio = min_varianza(mu, cov, limites)
+    solo_largos = limites is not None and limites[0] == 0 and limites[1] is None
+    if rendimiento_max is None:
+        # Sin posiciones cortas el mayor rendimiento posible es el del mejor activo
+        rendimiento_max = mu.max() if solo_largos else 2 * mu.max() - inicio['rendimiento']
+    objetivos = np.linspace(inicio['rendimiento'], rendimiento_max, n_puntos)
+
+    frontera = np.empty((n_puntos, 2 + n))
+    frontera[0] = np.concatenate(([inicio['volatilidad'], inicio['rendimiento']], inicio['pesos']))
+    for i, objetivo in enumerate(objetivos[1:], start=1):
+        if solo_largos and objetivo >= mu.max():
+            # Esquina de la frontera: todo en el activo de mayor rendimiento
+            pesos = np.zeros(n)
+            pesos[np.argmax(mu)] = 1.0
+            frontera[i] = np.concatenate(([np.sqrt(pesos @ cov @ pesos), pesos @ mu], pesos))
+            continue
+        inicio = min_varianza_objetivo(mu, cov, objetivo, limites, inicio=inicio)
+        frontera[i] = np.concatenate(([inicio['volatilidad'], inicio['rendimiento']], inicio['pesos']))
+    return frontera
@@ -0,0 +1,130 @@
+#Importaciones diferidas y reporte del tiempo de importación de cada página
+#
+#Uso: python importaciones.py [presupuesto_en_segundos]
+
+import ast
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+DIRECTORIO = Path(__file__).resolve().parent
+
+# Páginas que se ejecutan al entrar a la app o al navegar a ellas
+ENTRADAS = [
+    "Proyecto.py", "var_cvar_metricsA1.py", "draw_etf.py", "info.py", "max_sharpe_optr.py",
+    "Minimum_Vol.py", "10_opt.py", "portfolio_backtesting.py", "bl.py", "ProjectA1/proto1.py",
+]
+
+# Segundos de importación en frío que puede costar una página
+PRESUPUESTO_SEGUNDOS = 2.0
+
+class ModuloPerezoso:
+    """Módulo que se importa hasta que se usa alguno de sus atributos.
+
+    Sirve para librerías pesadas (matplotlib, seaborn, pypfopt, ...) que sólo
+    necesita alguna rama de una página: 'plt = perezoso("matplotlib.pyplot")'
+    no cuesta nada hasta el primer 'plt.subplots(...)'.
+    """
+
+    def __init__(self, nombre):
+        self.__dict__["_nombre"] = nombre
+        self.__dict__["_modulo"] = None
+
+    def _cargar(self):
+        if self._modulo is None:
+            self.__dict__["_modulo"] = importlib.import_module(self._nombre)
+        return self._modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self._cargar(), atributo)
+
+    def __setattr__(self, atributo, valor):
+        setattr(self._cargar(), atributo, valor)
+
+    def __repr__(self):
+        estado = "cargado" if self._modulo is not None else "sin cargar"
+        return f"<módulo perezoso {self._nombre} ({estado})>"
+
+def perezoso(nombre):
+    """Módulo ya importado o un ModuloPerezoso que lo importa en el primer uso"""
+    return sys.modules.get(nombre) or ModuloPerezoso(nombre)
+
+def importaciones_modulo(ruta):
+    """Módulos que un script importa al ejecutarse (sólo las importaciones de nivel de módulo)"""
+    arbol = ast.parse(Path(ruta).read_text(encoding="utf-8"))
+    nombres = []
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Import):
+            nombres.extend(alias.name for alias in nodo.names)
+        elif isinstance(nodo, ast.ImportFrom) and nodo.level == 0:
+            nombres.append(nodo.module)
+    return list(dict.fromkeys(nombres))
+
+def modulos_perezosos(ruta):
+    """Módulos que un script difiere con perezoso("...") (se revisan sin importarlos)"""
+    arbol = ast.parse(Path(ruta).read_text(encoding="utf-8"))
+    return list(dict.fromkeys(
+        nodo.args[0].value for nodo in ast.walk(arbol)
+        if isinstance(nodo, ast.Call) and isinstance(nodo.func, ast.Name) and nodo.func.id == "perezoso"
+        and nodo.args and isinstance(nodo.args[0], ast.Constant) and isinstance(nodo.args[0].value, str)))
+
+def _tiempos_importacion(codigo):
+    """Tiempo acumulado (s) de cada módulo de primer nivel que importa 'codigo' en un proceso nuevo"""
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                             capture_output=True, text=True, cwd=DIRECTORIO)
+    tiempos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "imported package" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        # Los módulos de primer nivel tienen un solo espacio antes del nombre
+        if len(nombre) - len(nombre.lstrip()) == 1:
+            tiempos[nombre.strip()] = int(acumulado) / 1e6
+    return tiempos, proceso.stdout.split()
+
+def medir_importaciones(ruta):
+    """Tiempo de importación en frío de un script, medido con 'python -X importtime'.
+
+    Las importaciones se hacen en un proceso nuevo; regresa el total en segundos,
+    los módulos de primer nivel ordenados por tiempo acumulado y los módulos que
+    no se pudieron importar (p. ej. porque no están instalados), incluidos los
+    que la página difiere con perezoso().
+    """
+    modulos = importaciones_modulo(ruta)
+    codigo = "\n".join(f"try:\n    import {m}\nexcept Exception:\n    print({m!r})" for m in modulos)
+    codigo += "\nimport importlib.util\n" + "\n".join(
+        f"if importlib.util.find_spec({m.split('.')[0]!r}) is None:\n    print({m!r})" for m in modulos_perezosos(ruta))
+    tiempos, faltantes = _tiempos_importacion(codigo)
+    # Lo que el intérprete importa al arrancar no es costo de la página
+    arranque, _ = _tiempos_importacion("pass")
+    tiempos = {nombre: t for nombre, t in tiempos.items() if nombre not in arranque and nombre not in faltantes}
+    ordenados = sorted(tiempos.items(), key=lambda t: t[1], reverse=True)
+    return sum(tiempos.values()), ordenados, faltantes
+
+def main():
+    presupuesto = float(sys.argv[1]) if len(sys.argv) > 1 else PRESUPUESTO_SEGUNDOS
+    excedidas, incompletas = [], []
+    for entrada in ENTRADAS:
+        total, modulos, faltantes = medir_importaciones(DIRECTORIO / entrada)
+        # Sin todas sus importaciones el tiempo medido no es el de la página: también falla
+        if faltantes:
+            estado = "INCOMPLETA"
+            incompletas.append(entrada)
+        elif total > presupuesto:
+            estado = "EXCEDE"
+            excedidas.append(entrada)
+        else:
+            estado = "OK"
+        print(f"{entrada:<28} {total:7.3f} s  {estado}")
+        for nombre, segundos in modulos[:5]:
+            print(f"    {nombre:<32} {segundos:7.3f} s")
+        if faltantes:
+            print(f"    sin instalar: {', '.join(faltantes)}")
+    print(f"Presupuesto {presupuesto:.2f} s por página; {len(excedidas)} página(s) lo exceden")
+    if incompletas:
+        print(f"{len(incompletas)} página(s) no se pudieron medir porque faltan módulos: {', '.join(incompletas)}")
+    return 1 if excedidas or incompletas else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
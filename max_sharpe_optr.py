@@ -1,13 +1,14 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 import plotly.express as px
-import plotly.graph_objects as go
-from numpy import *
-from numpy.linalg import multi_dot
-import pandas as pd
-import yfinance as yf
-from datetime import date
+from numpy import around
 import warnings
+import datos_compartidos
+from panel import PanelRetornos
+from simulacion import estadisticos_anuales
+from optimizador import max_sharpe
+from frontera import frontera_eficiente
+from tbill import tasa_anual_promedio
 
 # Ignorar advertencias
 warnings.filterwarnings('ignore')
@@ -24,44 +25,37 @@ symbols = ['EMB', 'XLE', 'SPXL', 'EEM', 'SHV']
 numofasset = len(symbols)
 numofportfolio = 10000
 
-# Función para descargar datos
-@st.cache
+# Función para descargar datos (compartidos con las demás páginas)
 def download_data(tickers, start_date='2010-01-01', end_date='2020-12-31'):
-    data = yf.download(tickers, start=start_date, end=end_date)
-    return data['Close']
+    return datos_compartidos.precios(tickers, start_date, end_date)
 
 # Descargar datos
-df = download_data(symbols)
+df = download_data(symbols)[symbols]
 
 # Normalizar los datos
 normalized_data = df['2010':] / df['2010':].iloc[0]
 
 # Calcular retornos de los ETFs
-returns = df.pct_change().fillna(0)
-
-# Función para simular portafolios
-def portfolio_simulation(returns):
-    rets, vols, wts = [], [], []
-    for i in range(numofportfolio):
-        weights = random.random(numofasset)[:, newaxis]
-        weights /= sum(weights)
-        rets.append(weights.T @ array(returns.mean() * 252)[:, newaxis])
-        vols.append(sqrt(multi_dot([weights.T, returns.cov() * 252, weights])))
-        wts.append(weights.flatten())
-    portdf = 100 * pd.DataFrame({
-        'port_rets': array(rets).flatten(),
-        'port_vols': array(vols).flatten(),
-        'weights': list(array(wts))
-    })
-    portdf['sharpe_ratio'] = portdf['port_rets'] / portdf['port_vols']
-    return round(portdf, 2)
+returns = PanelRetornos.desde_precios(df, dtype="float32", relleno=0.0)
+
+# Tasa libre de riesgo: promedio del T-bill en el mismo periodo
+tasa_rf = tasa_anual_promedio('2010-01-01', '2020-12-31')
 
 # Simular portafolios
-temp = portfolio_simulation(returns)
+temp = datos_compartidos.simulacion(returns, numofportfolio, tasa_rf)
+
+# Obtener el portafolio de máximo Sharpe Ratio resolviendo el problema directamente
+mu, cov = estadisticos_anuales(returns)
+optimo = max_sharpe(mu, cov, tasa_rf)
+max_sharpe_port = {
+    'port_rets': 100 * optimo['rendimiento'],
+    'port_vols': 100 * optimo['volatilidad'],
+    'sharpe_ratio': optimo['sharpe']
+}
+msrpwts = 100 * optimo['pesos']
 
-# Obtener el portafolio de máximo Sharpe Ratio
-max_sharpe_port = temp.iloc[temp.sharpe_ratio.idxmax()]
-msrpwts = max_sharpe_port['weights']
+# Frontera eficiente exacta (columnas: volatilidad, rendimiento, pesos)
+frontera = frontera_eficiente(mu, cov)
 
 # Asignación de activos para el máximo Sharpe Ratio
 allocation = dict(zip(symbols, around(msrpwts, 2)))
@@ -97,8 +91,9 @@ st.pyplot(fig_pie)
 # ---- Gráfica de portafolios simulados ----
 st.subheader('''Simulation Graph''')
 st.write('''To get the Max Sharpe Ratio Portfolio Allocation, 
-         we have simulated 10000 portfolios which are shown in the graphic below, the portfolio
-         of max sharpe is highlighted with a purple star''' )
+         we solve the max sharpe problem directly (long-only weights that add up to 100%).
+         As a reference we also simulated 10000 random portfolios, shown in the graphic below,
+         the portfolio of max sharpe is highlighted with a purple star''' )
 
 fig_scatter = px.scatter(
     temp,
@@ -110,6 +105,15 @@ fig_scatter = px.scatter(
     title="Monte Carlo Simulated Portfolio"
 )
 
+# Añadir la frontera eficiente
+fig_scatter.add_scatter(
+    mode='lines',
+    x=100 * frontera[:, 0],
+    y=100 * frontera[:, 1],
+    line=dict(color='white', width=3),
+    name='Efficient Frontier'
+)
+
 # Añadir el portafolio de máximo Sharpe Ratio como estrella
 fig_scatter.add_scatter(
     mode='markers',
@@ -131,9 +135,9 @@ fig_scatter.update_layout(
 
 st.plotly_chart(fig_scatter, use_container_width=True)
 
-st.write(''' Every time you run the page, the model will give you different weights 
-         for the max sharpe ratio portfolio, but by running this code a lot of times 
-         we identified the SPXL and the EEM etfs as the preferred allocations of this model. ''')
+st.write(''' Since the weights come from the optimizer and not from the random sample, 
+         the max sharpe ratio portfolio is the same every time you run the page 
+         and it always sits on the upper edge of the simulated portfolios. ''')
 # Pie de página
 st.markdown("The information above is not an investment recommendation")
 st.write("Credits: Alejandro Ramirez Camacho / Emilio Dominguez Venezuela.")
@@ -0,0 +1,96 @@
+#Huellas de datos y memoria LRU en proceso, sin dependencias de los motores
+#
+#covarianza.py, artifacts.py y datos_compartidos.py memorizan resultados por la
+#huella de sus entradas; este módulo sólo depende de numpy, pandas y panel.py.
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from panel import PanelRetornos
+
+def _agregar_huella(h, obj):
+    """Agrega un objeto a la huella: tipo, forma y dtype además de los valores"""
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        h.update(f"{type(obj).__name__}{obj.shape}".encode())
+        _agregar_huella(h, obj.to_numpy())
+        _agregar_huella(h, obj.index.to_numpy())
+        if isinstance(obj, pd.DataFrame):
+            _agregar_huella(h, list(obj.columns))
+    elif isinstance(obj, PanelRetornos):
+        # El dtype cuenta: un panel float32 y uno float64 dan artefactos distintos
+        h.update(b"PanelRetornos")
+        _agregar_huella(h, obj.valores)
+        _agregar_huella(h, obj.fechas.to_numpy())
+        _agregar_huella(h, obj.tickers)
+    elif isinstance(obj, pd.Index):
+        _agregar_huella(h, obj.to_numpy())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"ndarray{obj.shape}{obj.dtype.str}".encode())
+        if obj.dtype == object:
+            for elemento in obj.ravel():
+                _agregar_huella(h, elemento)
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+        for elemento in obj:
+            _agregar_huella(h, elemento)
+    elif isinstance(obj, dict):
+        h.update(f"dict[{len(obj)}]".encode())
+        for clave, valor in obj.items():
+            _agregar_huella(h, clave)
+            _agregar_huella(h, valor)
+    else:
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+def huella(*objetos):
+    """Huella (sha1) de los datos: valores, forma, dtype, índice y columnas de cada objeto.
+
+    Listas, tuplas, diccionarios y arreglos de objetos se recorren elemento por
+    elemento (repr() resume los arreglos grandes y dos entradas distintas
+    podrían dar la misma huella).
+    """
+    h = hashlib.sha1()
+    for obj in objetos:
+        _agregar_huella(h, obj)
+    return h.hexdigest()[:16]
+
+class CacheLRU:
+    """Resultados memorizados por clave con descarte LRU, segura entre hilos.
+
+    Guarda hasta max_entradas resultados y descarta el menos usado (las
+    sesiones de Streamlit comparten el proceso). Con 'copiar' cada resultado se
+    entrega a través de esa función, p. ej. para regresar copias.
+    """
+
+    def __init__(self, max_entradas=128, copiar=None):
+        self.max_entradas = max_entradas
+        self.copiar = copiar
+        self._memoria = OrderedDict()
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave, construir):
+        with self._candado:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                self.aciertos += 1
+                resultado = self._memoria[clave]
+                return self.copiar(resultado) if self.copiar else resultado
+        resultado = construir()
+        with self._candado:
+            self.fallos += 1
+            self._memoria[clave] = resultado
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.max_entradas:
+                self._memoria.popitem(last=False)
+        return self.copiar(resultado) if self.copiar else resultado
+
+    def limpiar(self):
+        with self._candado:
+            self._memoria.clear()
@@ -0,0 +1,142 @@
+#Metadatos de tickers (yf.Ticker().info) con descargas concurrentes y caché en disco
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+RUTA_DEFAULT = Path(__file__).resolve().parent / ".metadata"
+
+class YahooInfoFetcher:
+    """Descarga info y el último cierre de un ticker desde Yahoo Finance"""
+
+    def __call__(self, ticker):
+        import yfinance as yf
+        t = yf.Ticker(ticker)
+        info = dict(t.info)
+        historia = t.history(period="1d")
+        info["ultimo_cierre"] = float(historia["Close"].iloc[-1]) if not historia.empty else None
+        return info
+
+class StubFetcher:
+    """Regresa metadatos fijos (diccionario o archivo JSON {ticker: info}) para pruebas sin red.
+
+    'latencia' simula los segundos de cada consulta y 'llamadas' cuenta cuántas se hicieron.
+    """
+
+    def __init__(self, datos, latencia=0.0):
+        if not isinstance(datos, dict):
+            with open(datos) as f:
+                datos = json.load(f)
+        self.datos = datos
+        self.latencia = latencia
+        self.llamadas = 0
+        self._candado = threading.Lock()
+
+    def __call__(self, ticker):
+        with self._candado:
+            self.llamadas += 1
+        time.sleep(self.latencia)
+        if ticker not in self.datos:
+            raise KeyError(f"Sin metadatos para {ticker}")
+        return dict(self.datos[ticker])
+
+class MetadataStore:
+    """Info de tickers con caché en disco por TTL y consultas concurrentes.
+
+    Cada ticker se guarda en <ruta>/<TICKER>.json con la hora en que se obtuvo;
+    pasado el TTL se vuelve a pedir. Los tickers faltantes de una consulta se
+    piden todos a la vez en un pool de hilos y, si dos consultas piden el mismo
+    ticker al mismo tiempo, la segunda espera la descarga de la primera.
+    """
+
+    def __init__(self, ruta=RUTA_DEFAULT, fetcher=None, ttl=timedelta(days=1), max_hilos=32):
+        self.ruta = Path(ruta)
+        self.fetcher = fetcher if fetcher is not None else YahooInfoFetcher()
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos)
+        self._en_curso = {}
+        self._candado = threading.Lock()
+
+    def _ruta(self, ticker):
+        return self.ruta / f"{ticker}.json"
+
+    def _leer(self, ticker):
+        ruta = self._ruta(ticker)
+        if not ruta.exists():
+            return None
+        with open(ruta) as f:
+            entrada = json.load(f)
+        if datetime.now() - datetime.fromisoformat(entrada["obtenido"]) > self.ttl:
+            return None
+        return entrada["info"]
+
+    def _escribir(self, ticker, info):
+        self.ruta.mkdir(parents=True, exist_ok=True)
+        ruta = self._ruta(ticker)
+        temporal = ruta.with_name(f"{ruta.name}.tmp")
+        with open(temporal, "w") as f:
+            json.dump({"obtenido": datetime.now().isoformat(), "info": info}, f, default=str)
+        os.replace(temporal, ruta)
+
+    def _descargar(self, ticker):
+        try:
+            info = self.fetcher(ticker)
+            self._escribir(ticker, info)
+            return info
+        finally:
+            with self._candado:
+                self._en_curso.pop(ticker, None)
+
+    def _pedir(self, ticker):
+        """Futuro con la info del ticker; reutiliza una descarga en curso si la hay"""
+        with self._candado:
+            futuro = self._en_curso.get(ticker)
+            if futuro is None:
+                info = self._leer(ticker)
+                if info is not None:
+                    futuro = Future()
+                    futuro.set_result(info)
+                    return futuro
+                futuro = self._pool.submit(self._descargar, ticker)
+                self._en_curso[ticker] = futuro
+            return futuro
+
+    def obtener(self, tickers):
+        """Info de un ticker (dict) o de una lista de tickers ({ticker: dict}).
+
+        Un ticker cuya descarga falla regresa un diccionario vacío y no se guarda.
+        """
+        unico = isinstance(tickers, str)
+        lista = [tickers] if unico else list(dict.fromkeys(tickers))
+        futuros = {t: self._pedir(t) for t in lista}
+        resultado = {}
+        for ticker, futuro in futuros.items():
+            try:
+                resultado[ticker] = futuro.result()
+            except Exception:
+                resultado[ticker] = {}
+        return resultado[tickers] if unico else resultado
+
+_almacen = None
+
+def configurar_almacen(ruta=None, fetcher=None, ttl=timedelta(days=1)):
+    """Reemplaza el almacén global (p. ej. con un StubFetcher en pruebas)"""
+    global _almacen
+    _almacen = MetadataStore(ruta or RUTA_DEFAULT, fetcher, ttl)
+    return _almacen
+
+def almacen():
+    """Almacén global; METADATA_FIXTURES apunta a un JSON local en lugar de Yahoo"""
+    global _almacen
+    if _almacen is None:
+        fixtures = os.environ.get("METADATA_FIXTURES")
+        ruta = os.environ.get("METADATA_PATH", RUTA_DEFAULT)
+        _almacen = MetadataStore(ruta, StubFetcher(fixtures) if fixtures else None)
+    return _almacen
+
+def obtener_info(tickers):
+    return almacen().obtener(tickers)
@@ -0,0 +1,152 @@
+#Métricas de riesgo y rendimiento (sin Streamlit, para poder precalcularlas)
+
+import numpy as np
+import pandas as pd
+from drawdown import tabla_max_drawdown
+from panel import como_matriz, etiquetas
+from tbill import resolver_tasa
+
+# Función para calcular CVaR
+def calculate_cvar(returns, alpha=0.05):
+    var = np.percentile(returns, 100 * alpha)
+    cvar = returns[returns <= var].mean()
+    return cvar
+
+def _momentos_centrales(x):
+    """Sumas de las potencias 2, 3 y 4 de las desviaciones por columna (ignora NaN)"""
+    d = np.nan_to_num(x - np.nanmean(x, axis=0))
+    d2 = d * d
+    return d2.sum(axis=0), (d2 * d).sum(axis=0), (d2 * d2).sum(axis=0)
+
+def sesgo(n, s2, s3):
+    """Sesgo muestral por columna (mismo estimador que pandas.Series.skew)"""
+    m2, m3 = s2 / n, s3 / n
+    return np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+
+def curtosis(n, s2, s4):
+    """Exceso de curtosis por columna (mismo estimador que pandas.Series.kurtosis)"""
+    return (n + 1) * n * (n - 1) * s4 / ((n - 2) * (n - 3) * s2 ** 2) - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+
+def _percentil_ordenada(ordenada, n, alpha):
+    """Percentil con interpolación lineal (como np.percentile) de columnas ya ordenadas.
+
+    n es el número de datos válidos de cada columna (los NaN van al final).
+    Con alpha de forma (A, 1) regresa una matriz (A x N), un renglón por nivel.
+    """
+    posicion = (n - 1) * np.asarray(alpha, dtype=float)
+    bajo = np.floor(posicion).astype(int)
+    alto = np.minimum(bajo + 1, n - 1)
+    valor_bajo = np.take_along_axis(ordenada, np.atleast_2d(bajo), axis=0).reshape(posicion.shape)
+    valor_alto = np.take_along_axis(ordenada, np.atleast_2d(alto), axis=0).reshape(posicion.shape)
+    return valor_bajo + (posicion - bajo) * (valor_alto - valor_bajo)
+
+def _percentil_columnas(x, n, alpha):
+    """Percentil por columna ignorando NaN (los NaN quedan al final de cada columna)"""
+    if np.all(n == n[0]):
+        # Con el mismo número de datos basta con colocar los dos vecinos del percentil
+        bajo = int((n[0] - 1) * alpha)
+        return _percentil_ordenada(np.partition(x, [bajo, min(bajo + 1, n[0] - 1)], axis=0), n, alpha)
+    return _percentil_ordenada(np.sort(x, axis=0), n, alpha)
+
+def estadisticas_columnas(retornos, alpha=0.05):
+    """Estadísticas de todas las columnas de una matriz de retornos (T x N) en una pasada.
+
+    Cada columna usa sólo sus datos válidos, como dropna() por activo. Regresa un
+    diccionario de arreglos de longitud N: n, media, volatilidad, volatilidad de
+    los retornos negativos, sesgo, curtosis, VaR y CVaR al nivel alpha.
+    """
+    x = como_matriz(retornos)
+    x = x.reshape(-1, 1) if x.ndim == 1 else x
+    validos = ~np.isnan(x)
+    n = validos.sum(axis=0)
+
+    negativos = validos & (x < 0)
+    n_neg = negativos.sum(axis=0)
+    suma_neg = np.where(negativos, x, 0.0).sum(axis=0)
+    suma2_neg = np.where(negativos, x * x, 0.0).sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s2, s3, s4 = _momentos_centrales(x)
+        var = _percentil_columnas(x, np.maximum(n, 1), alpha)
+        en_cola = validos & (x <= var)
+        return {
+            'n': n,
+            'media': np.where(validos, x, 0.0).sum(axis=0) / n,
+            'volatilidad': np.sqrt(s2 / (n - 1)),
+            'volatilidad_negativa': np.sqrt((suma2_neg - suma_neg ** 2 / n_neg) / (n_neg - 1)),
+            'sesgo': sesgo(n, s2, s3),
+            'curtosis': curtosis(n, s2, s4),
+            'var': np.where(n > 0, var, np.nan),
+            'cvar': np.where(en_cola, x, 0.0).sum(axis=0) / en_cola.sum(axis=0)
+        }
+
+def _tasa_promedio(tasa_libre_riesgo, retornos):
+    """Tasa libre de riesgo promedio de cada columna en sus días válidos.
+
+    La tasa puede ser un escalar o una serie alineada con los renglones de los
+    retornos (p. ej. tbill.tasa_libre_riesgo); como el promedio del exceso
+    r - rf es la media de r menos el promedio de rf, Sharpe y Sortino con tasa
+    variable salen en la misma pasada que el resto de las métricas.
+    """
+    tasa = np.asarray(tasa_libre_riesgo, dtype=float)
+    if tasa.ndim == 0:
+        return tasa
+    x = como_matriz(retornos)
+    validos = ~np.isnan(x.reshape(len(x), -1))
+    return tasa @ validos / validos.sum(axis=0)
+
+# Métricas de cada ETF (tabla de var_cvar_metricsA1.py); la tasa va en las mismas unidades que los retornos.
+# Sin tasa se usa el T-bill de cada fecha multiplicado por 'escala' (100 con retornos en %)
+def metricas_etfs(daily_returns, risk_free_rate=None, escala=1):
+    risk_free_rate = resolver_tasa(risk_free_rate, daily_returns.index, escala=escala)
+    e = estadisticas_columnas(daily_returns)
+    exceso = e['media'] - _tasa_promedio(risk_free_rate, daily_returns)
+    metrics = pd.DataFrame({
+        "Mean": e['media'],
+        "Skewness": e['sesgo'],
+        "Excess Kurtosis": e['curtosis'],
+        "VaR (95%)": e['var'],
+        "CVaR (95%)": e['cvar'],
+        "Sharpe Ratio": exceso / e['volatilidad'],
+        "Sortino Ratio": exceso / e['volatilidad_negativa'],
+    }, index=daily_returns.columns)
+    return metrics.round(4)
+
+# Métricas de varios portafolios a la vez: columnas de retornos (T x P) y de valores.
+# La tasa libre de riesgo es diaria (escalar o serie alineada con los retornos; sin ella, el T-bill de cada fecha)
+def metricas_columnas(retornos, valores, tasa_libre_riesgo=None):
+    tasa_libre_riesgo = resolver_tasa(tasa_libre_riesgo, etiquetas(retornos)[0])
+    r = como_matriz(retornos)
+    e = estadisticas_columnas(r)
+    rendimiento_anual = e['media'] * 252
+    exceso_anual = (e['media'] - _tasa_promedio(tasa_libre_riesgo, r)) * 252
+    rendimiento_acumulado = np.nanprod(1 + r, axis=0) - 1
+    volatilidad_anual = e['volatilidad'] * np.sqrt(252)
+
+    info_dd = tabla_max_drawdown(valores)
+
+    metricas = pd.DataFrame({
+        'Rendimiento Anual (%)': rendimiento_anual * 100,
+        'Rendimiento Acumulado (%)': rendimiento_acumulado * 100,
+        'Volatilidad Anual (%)': volatilidad_anual * 100,
+        'Sharpe Ratio': exceso_anual / volatilidad_anual,
+        'Sortino Ratio': exceso_anual / e['volatilidad_negativa'],
+        'Sesgo': e['sesgo'],
+        'Curtosis': e['curtosis'],
+        'VaR 95%': e['var'],
+        'CVaR 95%': e['cvar'],
+        'Máximo Drawdown (%)': info_dd['max_drawdown'].to_numpy(dtype=float),
+        'Fecha Pico': info_dd['fecha_pico'].to_numpy(),
+        'Fecha Valle': info_dd['fecha_valle'].to_numpy(),
+        'Duración de la Caída (días)': info_dd['duracion_caida'].to_numpy(),
+        'Fecha Recuperación': info_dd['fecha_recuperacion'].to_numpy(),
+        'Duración Recuperación (días)': info_dd['duracion_recuperacion'].to_numpy(),
+        'Duración Total (días)': info_dd['duracion_total'].to_numpy()
+    }, index=valores.columns)
+
+    return metricas
+
+# Función para calcular métricas del portafolio
+def calcular_metricas_portafolio(precios, retornos, pesos, tasa_libre_riesgo=None):
+    metricas = metricas_columnas(retornos.to_frame(), precios.to_frame(), tasa_libre_riesgo)
+    return metricas.iloc[0].to_dict()
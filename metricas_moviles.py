@@ -0,0 +1,139 @@
+#Métricas de riesgo en ventanas móviles con actualizaciones incrementales
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+from metricas import curtosis, sesgo
+from panel import etiquetas
+
+def _sumas_moviles(x, ventana):
+    """Suma móvil por columna a partir de sumas acumuladas (O(1) por paso)"""
+    acumulada = np.cumsum(np.vstack((np.zeros((1, x.shape[1])), x)), axis=0)
+    suma = np.full(x.shape, np.nan)
+    suma[ventana - 1:] = acumulada[ventana:] - acumulada[:-ventana]
+    return suma
+
+def _tramos_sin_nan(columna, ventana):
+    """Tramos [inicio, fin) de una columna sin NaN que alcanzan para al menos una ventana"""
+    bordes = np.flatnonzero(np.diff(np.concatenate(([0], ~np.isnan(columna), [0]))))
+    return [(i, f) for i, f in zip(bordes[::2], bordes[1::2]) if f - i >= ventana]
+
+def _var_cvar_tramo(valores, ventana, bajo, alto, fraccion):
+    """VaR y CVaR de cada ventana completa de una lista sin NaN.
+
+    La ventana se guarda ordenada y junto con ella la suma de su cola (los
+    bajo + 1 valores más pequeños). En cada paso se quita el dato que sale y se
+    inserta el nuevo con búsqueda binaria; si alguno cae en la cola, la suma se
+    corrige en O(1) con el valor que cruza la frontera en vez de volver a sumarla.
+    """
+    ordenada = sorted(valores[:ventana])
+    cola = sum(ordenada[:bajo + 1])
+    siguiente = bajo + 1 < ventana
+    var, cvar = [], []
+    for t in range(ventana - 1, len(valores)):
+        if t >= ventana:
+            viejo = valores[t - ventana]
+            i = bisect_left(ordenada, viejo)
+            del ordenada[i]
+            if i <= bajo:
+                cola -= viejo
+                if siguiente:
+                    cola += ordenada[bajo]
+            nuevo = valores[t]
+            i = bisect_right(ordenada, nuevo)
+            ordenada.insert(i, nuevo)
+            if i <= bajo:
+                cola += nuevo
+                if siguiente:
+                    cola -= ordenada[bajo + 1]
+        v = ordenada[bajo] + fraccion * (ordenada[alto] - ordenada[bajo])
+        var.append(v)
+        # La cola son los bajo + 1 más pequeños y los siguientes que no pasan del VaR
+        # (sólo el vecino alto o empates con el VaR)
+        k = bisect_right(ordenada, v, bajo + 1)
+        cvar.append((cola + sum(ordenada[bajo + 1:k])) / k)
+    return var, cvar
+
+def _var_cvar_movil(x, ventana, alpha):
+    """VaR (percentil con interpolación lineal, como np.percentile) y CVaR móviles de cada columna.
+
+    Cada paso cuesta una búsqueda binaria más el corrimiento de la lista (un
+    memmove en C) y la suma de la cola se actualiza en O(1), sin ordenar ni
+    seleccionar la ventana completa. Una ventana con algún NaN da NaN: cada
+    tramo sin NaN de cada columna se recorre por separado.
+    """
+    T, N = x.shape
+    var = np.full((T, N), np.nan)
+    cvar = np.full((T, N), np.nan)
+    posicion = (ventana - 1) * alpha
+    bajo = int(posicion)
+    alto = min(bajo + 1, ventana - 1)
+    fraccion = posicion - bajo
+    for j in range(N):
+        for inicio, fin in _tramos_sin_nan(x[:, j], ventana):
+            v, c = _var_cvar_tramo(x[inicio:fin, j].tolist(), ventana, bajo, alto, fraccion)
+            var[inicio + ventana - 1:fin, j] = v
+            cvar[inicio + ventana - 1:fin, j] = c
+    return var, cvar
+
+def metricas_moviles(retornos, ventana=252, alpha=0.05, risk_free_rate=0.0):
+    """Media, volatilidad, Sharpe, Sortino, sesgo, curtosis, VaR y CVaR en ventanas móviles.
+
+    Los momentos salen de sumas móviles de potencias de los retornos y el VaR/CVaR
+    de una ventana ordenada por activo con la suma de su cola incremental. Una
+    ventana con algún NaN da NaN. Regresa un diccionario métrica -> DataFrame
+    (T x N) con las mismas unidades que los retornos (p. ej. diarias). La tasa
+    libre de riesgo puede ser un escalar o una serie alineada con los renglones;
+    con una serie se usa su promedio móvil.
+    """
+    # Las sumas móviles restan sumas acumuladas: siempre en float64 aunque el panel sea float32
+    x = np.asarray(retornos, dtype=float)
+    validos = ~np.isnan(x)
+    n = _sumas_moviles(validos.astype(float), ventana)
+    completa = n == ventana
+
+    # Centrar con la media global no cambia los momentos y evita cancelaciones
+    desplazamiento = np.nanmean(x, axis=0)
+    d = np.where(validos, x - desplazamiento, 0.0)
+    d2 = d * d
+    s1 = _sumas_moviles(d, ventana)
+    s2 = _sumas_moviles(d2, ventana)
+    s3 = _sumas_moviles(d2 * d, ventana)
+    s4 = _sumas_moviles(d2 * d2, ventana)
+
+    m = s1 / ventana
+    c2 = s2 - ventana * m ** 2
+    c3 = s3 - 3 * m * s2 + 2 * ventana * m ** 3
+    c4 = s4 - 4 * m * s3 + 6 * m ** 2 * s2 - 3 * ventana * m ** 4
+    media = m + desplazamiento
+    volatilidad = np.sqrt(c2 / (ventana - 1))
+
+    # Desviación estándar de los retornos negativos (como en metricas_etfs)
+    negativos = np.where(validos & (x < 0), x, 0.0)
+    n_neg = _sumas_moviles((validos & (x < 0)).astype(float), ventana)
+    suma_neg = _sumas_moviles(negativos, ventana)
+    suma2_neg = _sumas_moviles(negativos * negativos, ventana)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vol_negativa = np.sqrt((suma2_neg - suma_neg ** 2 / n_neg) / (n_neg - 1))
+
+    tasa = np.asarray(risk_free_rate, dtype=float)
+    if tasa.ndim == 1:
+        tasa = _sumas_moviles(tasa[:, np.newaxis], ventana) / ventana
+
+    var, cvar = _var_cvar_movil(x, ventana, alpha)
+
+    metricas = {
+        "Mean": media,
+        "Volatility": volatilidad,
+        "Sharpe Ratio": (media - tasa) / volatilidad,
+        "Sortino Ratio": (media - tasa) / vol_negativa,
+        "Skewness": sesgo(ventana, c2, c3),
+        "Excess Kurtosis": curtosis(ventana, c2, c4),
+        f"VaR ({100 * (1 - alpha):.0f}%)": var,
+        f"CVaR ({100 * (1 - alpha):.0f}%)": cvar,
+    }
+    indice, columnas = (None, None) if isinstance(retornos, pd.Series) else etiquetas(retornos)
+    return {nombre: pd.DataFrame(np.where(completa, valores, np.nan), index=indice, columns=columnas)
+            for nombre, valores in metricas.items()}
@@ -0,0 +1,133 @@
+#VaR Monte Carlo de un portafolio con escenarios generados por bloques en varios procesos
+#
+#Uso: python montecarlo.py   (VaR y CVaR de los portafolios de portfolio_config.py)
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from panel import como_matriz
+
+MODELOS = ['normal', 't', 'bootstrap']
+
+def _simular_bloque(modelo, n, pesos, mu, factor, grados_libertad, historico, horizonte, semilla):
+    """Rendimientos de n trayectorias de 'horizonte' días del portafolio"""
+    rng = np.random.default_rng(semilla)
+    if modelo == 'bootstrap':
+        dias = rng.integers(0, len(historico), size=(n, horizonte))
+        return historico[dias].sum(axis=1)
+
+    z = rng.standard_normal((n * horizonte, len(mu)))
+    if modelo == 't':
+        # t multivariada con la misma covarianza: se escala la normal por un chi-cuadrada común
+        chi2 = rng.chisquare(grados_libertad, size=(n * horizonte, 1))
+        z *= np.sqrt((grados_libertad - 2) / chi2)
+    rendimientos = (mu + z @ factor.T) @ pesos
+    return rendimientos.reshape(n, horizonte).sum(axis=1)
+
+def _histograma_bloque(bordes, *argumentos):
+    """Conteos y sumas por intervalo de un bloque: resumen de tamaño fijo"""
+    rendimientos = _simular_bloque(*argumentos)
+    intervalos = np.clip(np.searchsorted(bordes, rendimientos, side='right') - 1, 0, len(bordes) - 2)
+    return (np.bincount(intervalos, minlength=len(bordes) - 1),
+            np.bincount(intervalos, weights=rendimientos, minlength=len(bordes) - 1))
+
+def _cola_desde_histograma(bordes, conteos, sumas, alphas):
+    """VaR (interpolando dentro del intervalo) y CVaR a partir del histograma acumulado"""
+    total = conteos.sum()
+    acumulados = np.concatenate(([0], np.cumsum(conteos)))
+    sumas_acumuladas = np.concatenate(([0.0], np.cumsum(sumas)))
+    var = np.empty(len(alphas))
+    cvar = np.empty(len(alphas))
+    for i, alpha in enumerate(alphas):
+        objetivo = alpha * total
+        # Intervalo j tal que acumulados[j] < objetivo <= acumulados[j + 1]
+        j = int(np.clip(np.searchsorted(acumulados, objetivo) - 1, 0, len(conteos) - 1))
+        fraccion = (objetivo - acumulados[j]) / conteos[j] if conteos[j] else 0.0
+        var[i] = bordes[j] + fraccion * (bordes[j + 1] - bordes[j])
+        # Dentro del intervalo se toma la parte proporcional de su suma
+        cvar[i] = (sumas_acumuladas[j] + fraccion * sumas[j]) / objetivo
+    return var, cvar
+
+def var_montecarlo(pesos, mu, cov, n_escenarios=1_000_000, modelo='normal', alphas=(0.01, 0.05),
+                   horizonte=1, grados_libertad=5, historico=None, tam_bloque=100_000, semilla=None,
+                   procesos=1, n_intervalos=20_000, amplitud=15.0):
+    """VaR y CVaR del rendimiento de un portafolio con escenarios simulados.
+
+    modelo: 'normal' o 't' (retornos correlacionados con el factor de Cholesky
+    de cov; mu y cov diarios) o 'bootstrap' (días remuestreados de 'historico',
+    una matriz T x N de retornos diarios). Los escenarios se generan en bloques
+    de tam_bloque con semillas derivadas de 'semilla', así que el resultado no
+    depende del número de procesos. Cada bloque se resume en un histograma fijo
+    de n_intervalos en media ± amplitud desviaciones estándar, de modo que la
+    memoria no crece con n_escenarios. Regresa una tabla (niveles x [VaR, CVaR])
+    en rendimientos (negativos), como var_cvar.py.
+    """
+    pesos = np.asarray(pesos, dtype=float)
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    alphas = np.atleast_1d(np.asarray(alphas, dtype=float))
+    if modelo not in MODELOS:
+        raise ValueError(f"Modelo desconocido: {modelo}")
+
+    if modelo == 'bootstrap':
+        # Remuestrear días del panel y luego ponderar equivale a remuestrear el portafolio
+        matriz = como_matriz(historico)
+        historico = (matriz @ pesos.astype(matriz.dtype)).astype(float)
+        centro = historico.mean() * horizonte
+        escala = historico.std() * np.sqrt(horizonte)
+        factor = None
+    else:
+        factor = np.linalg.cholesky(cov)
+        centro = mu @ pesos * horizonte
+        escala = np.sqrt(pesos @ cov @ pesos * horizonte)
+    bordes = np.linspace(centro - amplitud * escala, centro + amplitud * escala, n_intervalos + 1)
+
+    tamanos = [tam_bloque] * (n_escenarios // tam_bloque)
+    if n_escenarios % tam_bloque:
+        tamanos.append(n_escenarios % tam_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    tareas = [(bordes, modelo, n, pesos, mu, factor, grados_libertad, historico, horizonte, s)
+              for n, s in zip(tamanos, semillas)]
+
+    inicio = time.perf_counter()
+    conteos = np.zeros(n_intervalos, dtype=np.int64)
+    sumas = np.zeros(n_intervalos)
+    procesos = procesos or os.cpu_count()
+    if procesos == 1:
+        for c, s in (_histograma_bloque(*t) for t in tareas):
+            conteos += c
+            sumas += s
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for c, s in pool.map(_histograma_bloque, *zip(*tareas)):
+                conteos += c
+                sumas += s
+
+    var, cvar = _cola_desde_histograma(bordes, conteos, sumas, alphas)
+    tabla = pd.DataFrame({'VaR': var, 'CVaR': cvar}, index=pd.Index(alphas, name='alpha'))
+    tabla.attrs['escenarios'] = n_escenarios
+    tabla.attrs['segundos'] = time.perf_counter() - inicio
+    return tabla
+
+def main():
+    from covarianza import obtener_covarianza
+    from portfolio_config import nombres_portafolios, pesos_list, simbolos
+    from price_store import obtener_precios
+
+    precios = obtener_precios(simbolos, '2021-01-01').ffill().dropna()
+    retornos = precios.pct_change().dropna()
+    mu, cov = retornos.mean().to_numpy(), obtener_covarianza(retornos.to_numpy(), periodos=1)
+    for nombre, pesos in zip(nombres_portafolios, pesos_list):
+        for modelo in MODELOS:
+            tabla = var_montecarlo(pesos, mu, cov, modelo=modelo, historico=retornos, semilla=0, procesos=None)
+            print(f"{nombre} ({modelo}): " + ", ".join(
+                f"VaR {100 * (1 - a):.0f}% {fila['VaR']:.4f} / CVaR {fila['CVaR']:.4f}"
+                for a, fila in tabla.iterrows())
+                + f"  [{tabla.attrs['segundos']:.2f} s]")
+
+if __name__ == "__main__":
+    main()
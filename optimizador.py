@@ -0,0 +1,140 @@
+#Optimizador determinista: máximo Sharpe, mínima varianza y mínima varianza con objetivo
+
+import numpy as np
+
+def _limites(limites, n):
+    """Convierte (inferior, superior) en dos vectores; None significa sin límite"""
+    if limites is None:
+        limites = (None, None)
+    inferior, superior = limites
+    inferior = np.full(n, -np.inf) if inferior is None else np.broadcast_to(np.asarray(inferior, dtype=float), (n,))
+    superior = np.full(n, np.inf) if superior is None else np.broadcast_to(np.asarray(superior, dtype=float), (n,))
+    return inferior, superior
+
+def _resolver_slsqp(Q, c, A, b, inferior, superior):
+    """Respaldo para los casos (raros) en que el conjunto activo no converge"""
+    from scipy.optimize import minimize
+
+    n = Q.shape[0]
+    x0 = np.linalg.lstsq(A, b, rcond=None)[0]
+    limites = [(None if np.isneginf(l) else l, None if np.isposinf(u) else u)
+               for l, u in zip(inferior, superior)]
+    resultado = minimize(lambda x: 0.5 * x @ Q @ x + c @ x, np.clip(x0, inferior, superior),
+                         jac=lambda x: Q @ x + c, bounds=limites, method='SLSQP',
+                         constraints=[{'type': 'eq', 'fun': lambda x: A @ x - b, 'jac': lambda x: A}],
+                         options={'ftol': 1e-15, 'maxiter': 1000})
+    if not resultado.success:
+        raise RuntimeError(f"El optimizador no convergió: {resultado.message}")
+    x = np.clip(resultado.x, inferior, superior)
+    estado = np.zeros(n, dtype=np.int8)
+    estado[np.isclose(x, inferior, atol=1e-9)] = -1
+    estado[np.isclose(x, superior, atol=1e-9)] = 1
+    return x, estado
+
+def resolver_qp(Q, c, A, b, inferior, superior, activos=None, max_iter=50, tol=1e-10):
+    """Resuelve min ½x'Qx + c'x  s.a.  Ax = b, inferior <= x <= superior.
+
+    Usa un método primal-dual de conjunto activo: en cada iteración fija las
+    variables del conjunto activo en su límite, resuelve el sistema KKT de las
+    libres y actualiza el conjunto con los multiplicadores. 'activos' (vector con
+    -1 límite inferior, +1 superior, 0 libre) permite arrancar desde la solución
+    de un problema cercano, que suele converger en una o dos iteraciones.
+    Regresa (x, activos).
+    """
+    n = Q.shape[0]
+    A = np.atleast_2d(A)
+    b = np.atleast_1d(b)
+    m = A.shape[0]
+    estado = np.zeros(n, dtype=np.int8) if activos is None else np.asarray(activos, dtype=np.int8).copy()
+
+    for _ in range(max_iter):
+        libres = estado == 0
+        x = np.where(estado < 0, inferior, np.where(estado > 0, superior, 0.0))
+        fijas = ~libres
+
+        # Sistema KKT reducido a las variables libres
+        Q_ll = Q[np.ix_(libres, libres)]
+        A_l = A[:, libres]
+        k = Q_ll.shape[0]
+        kkt = np.zeros((k + m, k + m))
+        kkt[:k, :k] = Q_ll
+        kkt[:k, k:] = -A_l.T
+        kkt[k:, :k] = A_l
+        lado = np.concatenate((-c[libres] - Q[np.ix_(libres, fijas)] @ x[fijas],
+                               b - A[:, fijas] @ x[fijas]))
+        try:
+            solucion = np.linalg.solve(kkt, lado)
+        except np.linalg.LinAlgError:
+            # Demasiadas variables fijas para cumplir las igualdades
+            break
+        x[libres] = solucion[:k]
+        nu = solucion[k:]
+        mu = Q @ x + c - A.T @ nu
+
+        nuevo = np.zeros(n, dtype=np.int8)
+        nuevo[(x < inferior - tol) | ((estado < 0) & (mu > -tol))] = -1
+        nuevo[(x > superior + tol) | ((estado > 0) & (mu < tol))] = 1
+        if np.array_equal(nuevo, estado):
+            return np.clip(x, inferior, superior), estado
+        estado = nuevo
+
+    return _resolver_slsqp(Q, c, A, b, inferior, superior)
+
+def _resultado(pesos, mu, cov, tasa_libre_riesgo, activos):
+    rendimiento = float(pesos @ mu)
+    volatilidad = float(np.sqrt(pesos @ cov @ pesos))
+    return {
+        'pesos': pesos,
+        'rendimiento': rendimiento,
+        'volatilidad': volatilidad,
+        'sharpe': (rendimiento - tasa_libre_riesgo) / volatilidad,
+        'activos': activos
+    }
+
+def _activos_previos(inicio):
+    return None if inicio is None else inicio['activos']
+
+def min_varianza(mu, cov, limites=(0, None), tasa_libre_riesgo=0.0, inicio=None):
+    """Portafolio global de mínima varianza (pesos suman 1)"""
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+    inferior, superior = _limites(limites, n)
+    pesos, activos = resolver_qp(cov, np.zeros(n), np.ones((1, n)), np.ones(1),
+                                 inferior, superior, _activos_previos(inicio))
+    return _resultado(pesos, mu, cov, tasa_libre_riesgo, activos)
+
+def min_varianza_objetivo(mu, cov, objetivo, limites=(0, None), tasa_libre_riesgo=0.0, inicio=None):
+    """Mínima varianza con rendimiento esperado igual a 'objetivo' (p. ej. 0.10)"""
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+    inferior, superior = _limites(limites, n)
+    A = np.vstack((np.ones(n), mu))
+    b = np.array([1.0, objetivo])
+    pesos, activos = resolver_qp(cov, np.zeros(n), A, b, inferior, superior, _activos_previos(inicio))
+    return _resultado(pesos, mu, cov, tasa_libre_riesgo, activos)
+
+def max_sharpe(mu, cov, tasa_libre_riesgo=0.0, limites=(0, None), inicio=None, gamma=0.0):
+    """Portafolio de máximo Sharpe.
+
+    Con límites homogéneos (sólo largos o sin límites) se resuelve el QP
+    equivalente min y'Σy s.a. (μ - rf)'y = 1, y >= 0 y se normaliza w = y / Σy.
+    gamma > 0 agrega la penalización L2 γ·y'y (como objective_functions.L2_reg
+    de PyPortfolioOpt), que reparte los pesos entre más activos.
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+    exceso = mu - tasa_libre_riesgo
+    if np.all(exceso <= 0):
+        raise ValueError("Ningún activo tiene rendimiento esperado mayor a la tasa libre de riesgo")
+
+    inferior, superior = _limites(limites, n)
+    if not (np.all((inferior == 0) | np.isneginf(inferior)) and np.all(np.isposinf(superior))):
+        raise ValueError("max_sharpe sólo admite límites (0, None) o None")
+
+    Q = cov + gamma * np.eye(n) if gamma else cov
+    y, activos = resolver_qp(Q, np.zeros(n), exceso[np.newaxis, :], np.ones(1),
+                             inferior, superior, _activos_previos(inicio))
+    return _resultado(y / y.sum(), mu, cov, tasa_libre_riesgo, activos)
@@ -0,0 +1,153 @@
+#Panel de retornos compacto: una sola matriz contigua de numpy con fechas y tickers
+#
+#Las páginas calculaban los retornos con pct_change() (y a veces * 100), lo que
+#crea DataFrames nuevos en float64 cada vez. PanelRetornos guarda los retornos
+#en un solo bloque (opcionalmente float32, la mitad de memoria) y entrega
+#columnas, ventanas de fechas y DataFrames como vistas, sin copiar los datos.
+#Los motores (drawdown, var_cvar, backtest, metricas, simulacion) reciben un
+#panel igual que un DataFrame y trabajan sobre su matriz en su propio dtype;
+#sólo las sumas acumuladas (ventanas móviles, covarianzas) suben a float64.
+
+import numpy as np
+import pandas as pd
+
+class PanelRetornos:
+    """Retornos (T x N) en una matriz contigua, con las fechas como índice y un mapa ticker -> columna.
+
+    Se comporta como un DataFrame de sólo lectura para los motores: tiene
+    'index', 'columns', 'shape' y 'dtype', np.asarray(panel) regresa la matriz
+    sin copiarla y panel[ticker] / panel[[tickers]] regresan vistas.
+    """
+
+    def __init__(self, valores, fechas, tickers):
+        # Sin copia: las ventanas y bloques de columnas son vistas de la matriz original
+        valores = np.asarray(valores)
+        self.valores = valores[:, np.newaxis] if valores.ndim == 1 else valores
+        self.fechas = pd.Index(fechas)
+        self.tickers = list(tickers)
+        self._posicion = {ticker: j for j, ticker in enumerate(self.tickers)}
+        if self.valores.shape != (len(self.fechas), len(self.tickers)):
+            raise ValueError(f"La matriz {self.valores.shape} no coincide con "
+                             f"{len(self.fechas)} fechas y {len(self.tickers)} tickers")
+
+    @classmethod
+    def desde_precios(cls, precios, dtype=np.float64, escala=1.0, relleno=None, quitar_primera=False):
+        """Retornos simples de un DataFrame de precios escritos directo en la matriz del panel.
+
+        Equivale a precios.pct_change() * escala (el primer renglón queda en NaN),
+        con relleno en lugar de los NaN (como fillna) y sin el primer renglón si
+        quitar_primera. Las diferencias se calculan en float64 y sólo el
+        resultado se guarda en 'dtype'.
+        """
+        if isinstance(precios, pd.Series):
+            precios = precios.to_frame()
+        p = np.asarray(precios, dtype=float)
+        inicio = 1 if quitar_primera and len(p) else 0
+        valores = np.empty((len(p) - inicio, p.shape[1]), dtype=dtype)
+
+        destino = valores[1 - inicio:]
+        # En float64 se calcula directo en la matriz; en otro dtype sólo se redondea el resultado
+        calculo = destino if valores.dtype == np.float64 else np.empty(destino.shape)
+        np.subtract(p[1:], p[:-1], out=calculo)
+        np.divide(calculo, p[:-1], out=calculo)
+        if escala != 1:
+            calculo *= escala
+        if calculo is not destino:
+            destino[...] = calculo
+        if not quitar_primera and len(valores):
+            valores[0] = np.nan
+        if relleno is not None:
+            valores[np.isnan(valores)] = relleno
+        return cls(valores, precios.index[inicio:], precios.columns)
+
+    @classmethod
+    def desde_retornos(cls, retornos, dtype=np.float64):
+        """Panel a partir de un DataFrame de retornos (una sola copia al dtype pedido)"""
+        if isinstance(retornos, pd.Series):
+            retornos = retornos.to_frame()
+        return cls(np.array(retornos, dtype=dtype, order='C'), retornos.index, retornos.columns)
+
+    @property
+    def index(self):
+        return self.fechas
+
+    @property
+    def columns(self):
+        return pd.Index(self.tickers)
+
+    @property
+    def shape(self):
+        return self.valores.shape
+
+    @property
+    def dtype(self):
+        return self.valores.dtype
+
+    @property
+    def nbytes(self):
+        return self.valores.nbytes
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and np.dtype(dtype) != self.valores.dtype:
+            return self.valores.astype(dtype)
+        return self.valores.copy() if copy else self.valores
+
+    def __getitem__(self, clave):
+        if isinstance(clave, (list, tuple, pd.Index, np.ndarray)):
+            return self.seleccionar(clave)
+        return self.serie(clave)
+
+    def __repr__(self):
+        return (f"<PanelRetornos {len(self.fechas)} fechas x {len(self.tickers)} tickers, "
+                f"{self.valores.dtype}, {self.valores.nbytes / 2 ** 20:.1f} MiB>")
+
+    def columna(self, ticker):
+        """Retornos de un ticker como vista (sin copia) de la matriz"""
+        return self.valores[:, self._posicion[ticker]]
+
+    def serie(self, ticker):
+        """Retornos de un ticker como Series con las fechas, sobre la misma memoria"""
+        return pd.Series(self.columna(ticker), index=self.fechas, name=ticker, copy=False)
+
+    def seleccionar(self, tickers):
+        """Panel con sólo algunos tickers.
+
+        Si forman un bloque consecutivo de columnas (en el mismo orden) el
+        panel nuevo comparte la memoria; en otro caso se copian esas columnas.
+        """
+        posiciones = [self._posicion[t] for t in tickers]
+        consecutivas = bool(posiciones) and posiciones == list(range(posiciones[0], posiciones[0] + len(posiciones)))
+        if consecutivas and len(posiciones) == len(self.tickers):
+            return self
+        bloque = self.valores[:, posiciones[0]:posiciones[-1] + 1] if consecutivas else self.valores[:, posiciones]
+        return PanelRetornos(bloque, self.fechas, tickers)
+
+    def ventana(self, inicio=None, fin=None):
+        """Panel de las fechas entre inicio y fin (inclusive, como .loc) que comparte la memoria"""
+        i = 0 if inicio is None else self.fechas.searchsorted(pd.Timestamp(inicio), side='left')
+        j = len(self.fechas) if fin is None else self.fechas.searchsorted(pd.Timestamp(fin), side='right')
+        return PanelRetornos(self.valores[i:j], self.fechas[i:j], self.tickers)
+
+    def marco(self):
+        """DataFrame sobre la misma memoria (para las funciones que necesitan pandas)"""
+        return pd.DataFrame(self.valores, index=self.fechas, columns=self.columns, copy=False)
+
+def como_matriz(datos):
+    """Matriz de numpy de un panel, DataFrame, Series o arreglo sin copiarla si ya es flotante.
+
+    A diferencia de np.asarray(datos, dtype=float) conserva float32, así que un
+    panel compacto no se duplica en float64 al entrar a un motor.
+    """
+    x = datos.valores if isinstance(datos, PanelRetornos) else np.asarray(datos)
+    return x if np.issubdtype(x.dtype, np.floating) else x.astype(float)
+
+def etiquetas(datos):
+    """(índice, columnas) de un panel o DataFrame; de una Series las columnas son [nombre]; (None, None) de un arreglo"""
+    if isinstance(datos, (PanelRetornos, pd.DataFrame)):
+        return datos.index, datos.columns
+    if isinstance(datos, pd.Series):
+        return datos.index, [datos.name]
+    return None, None
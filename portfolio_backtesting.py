@@ -1,51 +1,17 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
-import numpy as np
-from datetime import datetime
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import datos_compartidos
+from drawdown import calcular_drawdown
+from panel import PanelRetornos
+from portfolio_config import simbolos, pesos_list, nombres_portafolios
+from tbill import tasa_libre_riesgo
 
 # Función para obtener datos históricos de precios
 def obtener_datos_acciones(simbolos, start_date, end_date = None):
-    if end_date is None:
-        end_date = datetime.now()
-    data = yf.download(simbolos, start=start_date, end=end_date)['Close']
+    data = datos_compartidos.precios(simbolos, start_date, end_date)
     return data.ffill().dropna()
 
-# Función para calcular drawdown y su información clave
-def calcular_drawdown(precios):
-    high_water_mark = precios.expanding().max()
-    drawdown = (precios - high_water_mark) / high_water_mark
-    return drawdown, high_water_mark
-
-def obtener_max_drawdown_info(precios):
-    drawdown, _ = calcular_drawdown(precios)
-    max_drawdown = drawdown.min()
-    fecha_valle = drawdown.idxmin()
-    fecha_pico = precios.loc[:fecha_valle].idxmax()
-    duracion_caida = (fecha_valle - fecha_pico).days
-
-    post_valle = precios.loc[fecha_valle:]
-    fecha_recuperacion = post_valle[post_valle >= precios[fecha_pico]].first_valid_index()
-
-    if fecha_recuperacion is not None:
-        duracion_recuperacion = (fecha_recuperacion - fecha_valle).days
-        duracion_total = (fecha_recuperacion - fecha_pico).days
-    else:
-        duracion_recuperacion = None
-        duracion_total = None
-
-    return {
-        'max_drawdown': max_drawdown * 100,
-        'fecha_pico': fecha_pico,
-        'fecha_valle': fecha_valle,
-        'duracion_caida': duracion_caida,
-        'fecha_recuperacion': fecha_recuperacion,
-        'duracion_recuperacion': duracion_recuperacion,
-        'duracion_total': duracion_total
-    }
-
 # Función para graficar drawdown del portafolio
 def graficar_drawdown_portafolio(precios, titulo="Drawdown del Portafolio"):
     drawdown, hwm = calcular_drawdown(precios)
@@ -101,73 +67,29 @@ def graficar_drawdown_portafolio(precios, titulo="Drawdown del Portafolio"):
 
     return fig
 
-# Función para calcular métricas del portafolio
-def calcular_metricas_portafolio(precios, retornos, pesos, tasa_libre_riesgo=0.0116 / 252):
-    rendimiento_anual = retornos.mean() * 252
-    rendimiento_acumulado = (1 + retornos).prod() - 1
-    volatilidad_anual = retornos.std() * np.sqrt(252)
-    sharpe_ratio = (rendimiento_anual - tasa_libre_riesgo) / volatilidad_anual
-    sortino_ratio = (rendimiento_anual - tasa_libre_riesgo) / retornos[retornos < 0].std()
-    sesgo = retornos.skew()
-    curtosis = retornos.kurtosis()
-    var_95 = np.percentile(retornos, 5)
-    cvar_95 = retornos[retornos <= var_95].mean()
-
-    info_dd = obtener_max_drawdown_info(precios)
-
-    metricas = {
-        'Rendimiento Anual (%)': rendimiento_anual * 100,
-        'Rendimiento Acumulado (%)': rendimiento_acumulado * 100,
-        'Volatilidad Anual (%)': volatilidad_anual * 100,
-        'Sharpe Ratio': sharpe_ratio,
-        'Sortino Ratio': sortino_ratio,
-        'Sesgo': sesgo,
-        'Curtosis': curtosis,
-        'VaR 95%': var_95,
-        'CVaR 95%': cvar_95,
-        'Máximo Drawdown (%)': info_dd['max_drawdown'],
-        'Fecha Pico': info_dd['fecha_pico'],
-        'Fecha Valle': info_dd['fecha_valle'],
-        'Duración de la Caída (días)': info_dd['duracion_caida'],
-        'Fecha Recuperación': info_dd['fecha_recuperacion'],
-        'Duración Recuperación (días)': info_dd['duracion_recuperacion'],
-        'Duración Total (días)': info_dd['duracion_total']
-    }
-
-    return metricas
-
 # Parámetros de entrada
-simbolos = ['EMB', 'XLE', 'SPXL', 'EEM', 'SHV']
 start_date = '2021-01-01'
 end_date = '2023-12-31'
-pesos_1 = np.array([0.02, 0.0, 0.9991, 0.03, 0.04])
-pesos_2 = np.array([0.0001, 0.0272, 0.2326, 0.7372, 0.00028])
-pesos_3 = np.array([0.213934, 0.049223, 0.715274, -0.019618, 0.041187])
-pesos_4 = np.array([0.2, 0.2, 0.2, 0.2, 0.2])
-pesos_list = [pesos_1, pesos_2, pesos_3, pesos_4]
-
-nombres_portafolios = [
-    "Minimum Volatility Portfolio",
-    "Max Sharpe Ratio Portfolio",
-    "Minimum Volatility Portfolio with 10% objective (MXN)",
-    "Equally-Weighted Portfolio"
-]
 
 precios = obtener_datos_acciones(simbolos, start_date)
-retornos = precios.pct_change().dropna()
+retornos = PanelRetornos.desde_precios(precios, dtype="float32", quitar_primera=True)
+
+# Tasa libre de riesgo diaria del T-bill vigente en cada fecha
+tasa_rf = tasa_libre_riesgo(retornos.index)
+
+# Los cuatro portafolios se evalúan juntos (un solo producto matricial)
+resultado = datos_compartidos.backtest(retornos, pesos_list, nombres_portafolios, tasa_rf)
 
 # Interfaz de Streamlit
 st.title("Portafolio Backtesting Analysis")
 
-tipo_vista = st.radio("Select Preferred View:", ("Individual Portfolio Analysis", "Returns against S&P500"))
+tipo_vista = st.radio("Select Preferred View:", ("Individual Portfolio Analysis", "Returns against S&P500",
+                                                "Rebalancing and Transaction Costs"))
 
 if tipo_vista == "Individual Portfolio Analysis":
     portafolio_seleccionado = st.selectbox("Seleccione un portafolio:", nombres_portafolios)
-    idx = nombres_portafolios.index(portafolio_seleccionado)
-    pesos = pesos_list[idx]
-    precios_portafolio = (retornos * pesos).sum(axis=1).cumsum()
-
-    metricas = calcular_metricas_portafolio(precios_portafolio, retornos @ pesos, pesos)
+    precios_portafolio = resultado['valor'][portafolio_seleccionado]
+    metricas = resultado['metricas'].loc[portafolio_seleccionado]
 
     st.subheader(f"Metrics of  {portafolio_seleccionado}")
     st.markdown("""
@@ -208,10 +130,23 @@ if tipo_vista == "Individual Portfolio Analysis":
         metricas['Duración Total (días)']
     ))
 
+    # Error de estimación de las métricas (bootstrap de bloques estacionario)
+    st.subheader("Bootstrap 95% Confidence Intervals")
+    intervalos = datos_compartidos.intervalos_confianza(resultado['retornos'][portafolio_seleccionado])
+    intervalos.columns = ["Estimate", "Lower", "Upper", "Std. Error"]
+    st.dataframe(intervalos.style.format("{:.4f}"))
+
+    # VaR con escenarios simulados además del histórico
+    st.subheader("Monte Carlo VaR (1,000,000 scenarios)")
+    pesos_seleccionados = pesos_list[nombres_portafolios.index(portafolio_seleccionado)]
+    var_mc = datos_compartidos.var_montecarlo(retornos, pesos_seleccionados)
+    var_mc.index = ["Multivariate Normal", "Multivariate Student-t", "Historical Bootstrap"]
+    st.dataframe(var_mc.style.format("{:.4f}"))
+
     fig = graficar_drawdown_portafolio(precios_portafolio, f"{portafolio_seleccionado} Drawdown")
     st.plotly_chart(fig)
 
-else:
+elif tipo_vista == "Returns against S&P500":
     sp500 = obtener_datos_acciones(['^GSPC'], start_date)
     sp500_retornos = sp500.pct_change().dropna()
     sp500_acumulado = (1 + sp500_retornos).cumprod() - 1
@@ -219,15 +154,14 @@ else:
     fig_comparacion = go.Figure()
 
     colores = ["#2C3E50", "#1ABC9C", "#6A5ACD", "#4682B4", "#708090"]
-    for i, pesos in enumerate(pesos_list):
-        precios_portafolio = (retornos * pesos).sum(axis=1)
-        rendimiento_acumulado = (1 + precios_portafolio).cumprod() - 1
+    for i, nombre in enumerate(nombres_portafolios):
+        rendimiento_acumulado = resultado['valor'][nombre] / 100 - 1
 
         fig_comparacion.add_trace(go.Scatter(
             x=rendimiento_acumulado.index,
             y=rendimiento_acumulado,
             mode='lines',
-            name=nombres_portafolios[i],
+            name=nombre,
             line=dict(color=colores[i % len(colores)])
         ))
 
@@ -279,3 +213,44 @@ else:
              of its inicial value, and eventhough the volatility is quite high, the return
              keeping in mind the risk is more than acceptable. ''')
 
+else:
+    portafolio_seleccionado = st.selectbox("Seleccione un portafolio:", nombres_portafolios)
+    pesos = pesos_list[nombres_portafolios.index(portafolio_seleccionado)]
+
+    etiquetas_frecuencia = {"mensual": "Monthly", "trimestral": "Quarterly", "anual": "Yearly", None: "Never (Buy and Hold)"}
+    frecuencia = st.selectbox("Rebalancing Frequency:", list(etiquetas_frecuencia), format_func=etiquetas_frecuencia.get)
+    umbral = st.slider("Drift Threshold (% from target weight, 0 = off):", 0.0, 20.0, 0.0, 0.5)
+    costo_proporcional = st.number_input("Proportional Cost (bps per traded value):", 0.0, 100.0, 10.0)
+    costo_fijo = st.number_input("Fixed Cost per Trade (100 base):", 0.0, 1.0, 0.0, 0.01)
+
+    rebalanceo = datos_compartidos.rebalanceo(retornos, pesos, frecuencia, umbral / 100 if umbral > 0 else None,
+                                               costo_proporcional / 10000, costo_fijo, tasa_libre_riesgo=tasa_rf)
+
+    fig_rebalanceo = go.Figure()
+    fig_rebalanceo.add_trace(go.Scatter(
+        x=resultado['valor'].index,
+        y=resultado['valor'][portafolio_seleccionado],
+        mode='lines',
+        name='Constant Weights (no costs)',
+        line=dict(color="#708090", dash='dash')
+    ))
+    fig_rebalanceo.add_trace(go.Scatter(
+        x=rebalanceo['valor'].index,
+        y=rebalanceo['valor'],
+        mode='lines',
+        name='With Rebalancing and Costs',
+        line=dict(color="#6A5ACD")
+    ))
+    fig_rebalanceo.update_layout(
+        title=f"{portafolio_seleccionado} - Rebalancing Backtest",
+        xaxis_title="Date",
+        yaxis_title="Value (100 Base)",
+        height=450
+    )
+    st.plotly_chart(fig_rebalanceo)
+
+    st.write(f"**Number of Rebalances:** {len(rebalanceo['rebalanceos'])}")
+    st.write(f"**Total Transaction Costs (100 base):** {rebalanceo['costos'].sum():.4f}")
+    st.write(f"**Final Value:** {rebalanceo['valor'].iloc[-1]:.2f}")
+    st.write(f"**Sharpe Ratio:** {rebalanceo['metricas']['Sharpe Ratio']:.2f}")
+    st.write(f"**Max Drawdown (%):** {rebalanceo['metricas']['Máximo Drawdown (%)']:.2f}%")
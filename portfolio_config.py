@@ -0,0 +1,17 @@
+#Portafolios de pesos fijos que se comparan en portfolio_backtesting.py
+
+import numpy as np
+
+simbolos = ['EMB', 'XLE', 'SPXL', 'EEM', 'SHV']
+pesos_1 = np.array([0.02, 0.0, 0.9991, 0.03, 0.04])
+pesos_2 = np.array([0.0001, 0.0272, 0.2326, 0.7372, 0.00028])
+pesos_3 = np.array([0.213934, 0.049223, 0.715274, -0.019618, 0.041187])
+pesos_4 = np.array([0.2, 0.2, 0.2, 0.2, 0.2])
+pesos_list = [pesos_1, pesos_2, pesos_3, pesos_4]
+
+nombres_portafolios = [
+    "Minimum Volatility Portfolio",
+    "Max Sharpe Ratio Portfolio",
+    "Minimum Volatility Portfolio with 10% objective (MXN)",
+    "Equally-Weighted Portfolio"
+]
@@ -0,0 +1,216 @@
+#Almacén local de precios compartido por todas las páginas
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RUTA_DEFAULT = Path(__file__).resolve().parent / ".price_store"
+
+def _calendario_bolsa():
+    """Feriados de la bolsa de Nueva York (Año Nuevo en sábado no se recorre al viernes)"""
+    from pandas.tseries.holiday import (AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay,
+                                        USMartinLutherKingJr, USMemorialDay, USPresidentsDay,
+                                        USThanksgivingDay, nearest_workday, sunday_to_monday)
+
+    class CalendarioBolsa(AbstractHolidayCalendar):
+        rules = [
+            Holiday("Año Nuevo", month=1, day=1, observance=sunday_to_monday),
+            USMartinLutherKingJr, USPresidentsDay, GoodFriday, USMemorialDay,
+            Holiday("Juneteenth", month=6, day=19, start_date="2022-06-19", observance=nearest_workday),
+            Holiday("Independencia", month=7, day=4, observance=nearest_workday),
+            USLaborDay, USThanksgivingDay,
+            Holiday("Navidad", month=12, day=25, observance=nearest_workday),
+        ]
+
+    return CalendarioBolsa()
+
+def hay_sesiones(inicio, fin):
+    """True si entre [inicio, fin) debería haber al menos una sesión de la bolsa"""
+    fin = pd.Timestamp(fin) - pd.Timedelta(days=1)
+    if pd.Timestamp(inicio) > fin:
+        return False
+    return len(pd.bdate_range(inicio, fin, freq="C", holidays=_calendario_bolsa().holidays(inicio, fin))) > 0
+
+class YahooFetcher:
+    """Descarga la serie de un ticker desde Yahoo Finance"""
+
+    def __call__(self, ticker, start, end, campo="Close"):
+        import yfinance as yf
+        data = yf.download(ticker, start=start, end=end, progress=False, auto_adjust=False)
+        if data.empty:
+            return pd.Series(dtype=float)
+        serie = data[campo]
+        if isinstance(serie, pd.DataFrame):
+            serie = serie.iloc[:, 0]
+        return serie.dropna()
+
+class CsvFetcher:
+    """Lee precios de archivos <directorio>/<TICKER>.csv (para pruebas sin red)"""
+
+    def __init__(self, directorio):
+        self.directorio = Path(directorio)
+
+    def __call__(self, ticker, start, end, campo="Close"):
+        datos = pd.read_csv(self.directorio / f"{ticker}.csv", index_col=0, parse_dates=True)
+        serie = datos[campo].sort_index()
+        return serie.loc[pd.Timestamp(start):pd.Timestamp(end) - pd.Timedelta(days=1)].dropna()
+
+class PriceStore:
+    """Guarda cada ticker en dos columnas binarias (fechas int64 y precios float64).
+
+    Los archivos se leen con memoria mapeada y sólo crecen por el final: al pedir un
+    rango que termina después de lo guardado se descarga únicamente la cola faltante.
+    Las actualizaciones de un mismo ticker se serializan con un candado, así que
+    varios hilos (sesiones o descargas concurrentes) no anexan dos veces la cola.
+    """
+
+    def __init__(self, ruta=RUTA_DEFAULT, fetcher=None):
+        self.ruta = Path(ruta)
+        self.fetcher = fetcher if fetcher is not None else YahooFetcher()
+        self._candados = {}
+        self._candado = threading.Lock()
+
+    def _candado_ticker(self, ticker, campo):
+        with self._candado:
+            return self._candados.setdefault((ticker, campo), threading.Lock())
+
+    def _rutas(self, ticker, campo):
+        carpeta = self.ruta / campo.replace(" ", "_")
+        carpeta.mkdir(parents=True, exist_ok=True)
+        return (carpeta / f"{ticker}.fechas.i8", carpeta / f"{ticker}.valores.f8", carpeta / f"{ticker}.json")
+
+    def _leer_meta(self, ruta_meta):
+        if not ruta_meta.exists():
+            return None
+        with open(ruta_meta) as f:
+            return json.load(f)
+
+    def _escribir_meta(self, ruta_meta, meta):
+        temporal = ruta_meta.with_suffix(".tmp")
+        with open(temporal, "w") as f:
+            json.dump(meta, f)
+        os.replace(temporal, ruta_meta)
+
+    def leer(self, ticker, campo="Close"):
+        """Regresa la serie guardada de un ticker sin tocar la red"""
+        ruta_fechas, ruta_valores, _ = self._rutas(ticker, campo)
+        if not ruta_fechas.exists() or ruta_fechas.stat().st_size == 0:
+            return pd.Series(dtype=float, name=ticker, index=pd.DatetimeIndex([], name="Date"))
+        fechas = np.memmap(ruta_fechas, dtype=np.int64, mode="r")
+        valores = np.memmap(ruta_valores, dtype=np.float64, mode="r")
+        n = min(len(fechas), len(valores))
+        indice = pd.DatetimeIndex(fechas[:n].astype("datetime64[D]"), name="Date")
+        return pd.Series(np.asarray(valores[:n]), index=indice, name=ticker)
+
+    def _anexar(self, ticker, campo, serie):
+        ruta_fechas, ruta_valores, _ = self._rutas(ticker, campo)
+        dias = serie.index.values.astype("datetime64[D]").astype(np.int64)
+        # Primero los valores y luego las fechas: leer() usa el mínimo de ambas longitudes
+        with open(ruta_valores, "ab") as f:
+            f.write(serie.to_numpy(dtype=np.float64).tobytes())
+        with open(ruta_fechas, "ab") as f:
+            f.write(dias.tobytes())
+
+    def _reescribir(self, ticker, campo, serie):
+        ruta_fechas, ruta_valores, _ = self._rutas(ticker, campo)
+        for ruta in (ruta_fechas, ruta_valores):
+            if ruta.exists():
+                ruta.unlink()
+        self._anexar(ticker, campo, serie)
+
+    def actualizar(self, ticker, start, end=None, campo="Close"):
+        """Asegura que el rango [start, end) esté en disco descargando sólo lo faltante.
+
+        Sólo se guardan sesiones completas (hasta ayer): la barra parcial de hoy
+        no se escribe. Una descarga completa vacía (Yahoo no lanza excepción
+        cuando falla) no escribe nada ni marca el rango como cubierto; una cola
+        sin sesiones según el calendario (fin de semana o feriado) no se
+        descarga y sólo avanza el rango cubierto.
+        """
+        with self._candado_ticker(ticker, campo):
+            self._actualizar(ticker, start, end, campo)
+
+    def _actualizar(self, ticker, start, end, campo):
+        inicio = pd.Timestamp(start).normalize()
+        hoy = pd.Timestamp(datetime.now()).normalize()
+        fin = min(pd.Timestamp(end).normalize(), hoy) if end is not None else hoy
+        ruta_fechas, _, ruta_meta = self._rutas(ticker, campo)
+        meta = self._leer_meta(ruta_meta)
+        if meta is not None and (not ruta_fechas.exists() or ruta_fechas.stat().st_size == 0):
+            # Meta de una descarga vacía de versiones anteriores: se vuelve a descargar
+            meta = None
+
+        if meta is None or inicio < pd.Timestamp(meta["desde"]):
+            # Falta el inicio de la historia: se descarga completa una sola vez
+            hasta = max(fin, pd.Timestamp(meta["hasta"])) if meta else fin
+            serie = self.fetcher(ticker, inicio, hasta, campo)
+            if not len(serie):
+                return
+            self._reescribir(ticker, campo, serie)
+            meta = {"desde": str(inicio.date()), "hasta": str(hasta.date())}
+        elif fin > pd.Timestamp(meta["hasta"]):
+            guardado = self.leer(ticker, campo)
+            desde_cola = pd.Timestamp(meta["hasta"])
+            if len(guardado):
+                desde_cola = max(desde_cola, guardado.index[-1] + pd.Timedelta(days=1))
+            if hay_sesiones(desde_cola, fin):
+                cola = self.fetcher(ticker, desde_cola, fin, campo)
+                if not len(cola):
+                    # Debía haber sesiones: descarga fallida, se reintenta en la siguiente llamada
+                    return
+                cola = cola[cola.index > guardado.index[-1]]
+                if len(cola):
+                    self._anexar(ticker, campo, cola)
+            meta["hasta"] = str(fin.date())
+        else:
+            return
+        self._escribir_meta(ruta_meta, meta)
+
+    def obtener(self, tickers, start, end=None, campo="Close"):
+        """Precios para uno o varios tickers en [start, end), como yf.download(...)[campo]"""
+        unico = isinstance(tickers, str)
+        lista = [tickers] if unico else list(tickers)
+        lista = [t.strip().upper() for t in lista]
+        inicio = pd.Timestamp(start)
+        fin = pd.Timestamp(end) if end is not None else None
+
+        series = {}
+        for ticker in lista:
+            self.actualizar(ticker, inicio, fin, campo)
+            serie = self.leer(ticker, campo)
+            mascara = serie.index >= inicio
+            if fin is not None:
+                mascara &= serie.index < fin
+            series[ticker] = serie[mascara]
+
+        if unico:
+            return series[lista[0]]
+        # yf.download ordena las columnas alfabéticamente; se conserva ese orden
+        datos = pd.DataFrame({t: series[t] for t in sorted(set(lista))})
+        datos.index.name = "Date"
+        return datos
+
+_almacen = None
+
+def configurar_almacen(ruta=None, fetcher=None):
+    """Reemplaza el almacén global (p. ej. con un CsvFetcher en pruebas)"""
+    global _almacen
+    _almacen = PriceStore(ruta or RUTA_DEFAULT, fetcher)
+    return _almacen
+
+def almacen():
+    """Almacén global; PRICE_STORE_FIXTURES apunta a CSVs locales en lugar de Yahoo"""
+    global _almacen
+    if _almacen is None:
+        fixtures = os.environ.get("PRICE_STORE_FIXTURES")
+        ruta = os.environ.get("PRICE_STORE_PATH", RUTA_DEFAULT)
+        _almacen = PriceStore(ruta, CsvFetcher(fixtures) if fixtures else None)
+    return _almacen
+
+def obtener_precios(tickers, start, end=None, campo="Close"):
+    return almacen().obtener(tickers, start, end, campo)
@@ -0,0 +1,61 @@
+#Motor vectorizado para la simulación Monte Carlo de portafolios
+
+import numpy as np
+
+from covarianza import obtener_covarianza
+from panel import como_matriz
+
+DIAS_ANUALES = 252
+
+def estadisticos_anuales(retornos, periodos=DIAS_ANUALES, metodo='muestral'):
+    """Calcula una sola vez el vector de medias y la covarianza anualizados.
+
+    La covarianza sale del servicio compartido de covarianza.py ('muestral',
+    'ledoit_wolf', 'oas' o 'ewma'), así que se reutiliza entre páginas.
+    """
+    matriz = como_matriz(retornos)
+    mu = np.nanmean(matriz, axis=0, dtype=float) * periodos
+    cov = obtener_covarianza(matriz, metodo, periodos=periodos)
+    return mu, cov
+
+def iterar_bloques(mu, cov, n_portafolios, tam_bloque=100_000, semilla=None, tasa_libre_riesgo=0.0):
+    """Genera los portafolios simulados por bloques de tamaño fijo.
+
+    Cada bloque es una tupla (pesos, rendimientos, volatilidades, sharpe) calculada
+    con operaciones matriciales, así que la memoria depende de tam_bloque y no de
+    n_portafolios.
+    """
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    rng = np.random.default_rng(semilla)
+    n_activos = mu.shape[0]
+
+    for inicio in range(0, n_portafolios, tam_bloque):
+        m = min(tam_bloque, n_portafolios - inicio)
+        pesos = rng.random((m, n_activos))
+        pesos /= pesos.sum(axis=1, keepdims=True)
+        rendimientos = pesos @ mu
+        volatilidades = np.sqrt(np.einsum('ij,ij->i', pesos @ cov, pesos))
+        sharpe = (rendimientos - tasa_libre_riesgo) / volatilidades
+        yield pesos, rendimientos, volatilidades, sharpe
+
+def simular_portafolios(mu, cov, n_portafolios=10000, tam_bloque=100_000, semilla=None, tasa_libre_riesgo=0.0):
+    """Simula n_portafolios y regresa todos los pesos, rendimientos, volatilidades y sharpe"""
+    bloques = list(iterar_bloques(mu, cov, n_portafolios, tam_bloque, semilla, tasa_libre_riesgo))
+    pesos, rendimientos, volatilidades, sharpe = (np.concatenate(col) for col in zip(*bloques))
+    return pesos, rendimientos, volatilidades, sharpe
+
+def mejor_portafolio(mu, cov, n_portafolios, tam_bloque=100_000, semilla=None, tasa_libre_riesgo=0.0):
+    """Busca el portafolio de máximo Sharpe sin guardar toda la simulación (memoria acotada)"""
+    mejor = None
+    for pesos, rendimientos, volatilidades, sharpe in iterar_bloques(
+            mu, cov, n_portafolios, tam_bloque, semilla, tasa_libre_riesgo):
+        i = int(np.argmax(sharpe))
+        if mejor is None or sharpe[i] > mejor['sharpe_ratio']:
+            mejor = {
+                'port_rets': rendimientos[i],
+                'port_vols': volatilidades[i],
+                'sharpe_ratio': sharpe[i],
+                'weights': pesos[i].copy()
+            }
+    return mejor
@@ -0,0 +1,123 @@
+#Serie del Treasury Bill (datos.csv) con consultas por rango de fechas en O(log n)
+#
+#También es la fuente de la tasa libre de riesgo de métricas y optimizadores.
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RUTA_DATOS = Path(__file__).resolve().parent / "datos.csv"
+
+class SerieTBill:
+    """Tasas ordenadas por fecha con sumas acumuladas y tablas dispersas de mínimos y máximos.
+
+    Un rango [inicio, fin] se ubica con búsqueda binaria; el promedio sale de las
+    sumas acumuladas y el mínimo/máximo de dos consultas a la tabla dispersa, así
+    que cada consulta es O(log n). Todas las consultas aceptan escalares o arreglos
+    de fechas (muchos rangos a la vez).
+    """
+
+    def __init__(self, fechas, tasas):
+        orden = np.argsort(fechas, kind="stable")
+        self.fechas = np.asarray(fechas, dtype="datetime64[D]")[orden]
+        self.tasas = np.asarray(tasas, dtype=float)[orden]
+        self.acumulada = np.concatenate(([0.0], np.cumsum(self.tasas)))
+        self.tabla_min = self._tabla_dispersa(np.minimum)
+        self.tabla_max = self._tabla_dispersa(np.maximum)
+
+    @classmethod
+    def desde_csv(cls, ruta=RUTA_DATOS):
+        datos = pd.read_csv(ruta, usecols=["Date", "Price"])
+        fechas = pd.to_datetime(datos["Date"], format="%m/%d/%Y")
+        return cls(fechas.to_numpy(), datos["Price"].to_numpy())
+
+    def _tabla_dispersa(self, operacion):
+        """Renglón k: resultado de la operación sobre los 2^k valores que empiezan en cada posición"""
+        n = len(self.tasas)
+        niveles = int(np.log2(n)) + 1 if n else 1
+        tabla = np.full((niveles, n), np.nan)
+        tabla[0] = self.tasas
+        for k in range(1, niveles):
+            mitad = 2 ** (k - 1)
+            validos = n - 2 * mitad + 1
+            tabla[k, :validos] = operacion(tabla[k - 1, :validos], tabla[k - 1, mitad:mitad + validos])
+        return tabla
+
+    def _rango(self, inicio, fin):
+        """Posiciones [i, j) de las fechas entre inicio y fin (ambas incluidas)"""
+        i = np.searchsorted(self.fechas, np.asarray(inicio, dtype="datetime64[D]"), side="left")
+        j = np.searchsorted(self.fechas, np.asarray(fin, dtype="datetime64[D]"), side="right")
+        return i, np.maximum(j, i)
+
+    def _consultar(self, tabla, operacion, inicio, fin):
+        """Mínimo o máximo del rango con dos bloques de 2^k que se traslapan"""
+        i, j = self._rango(inicio, fin)
+        longitud = j - i
+        k = np.floor(np.log2(np.maximum(longitud, 1))).astype(int)
+        ultimo = len(self.tasas) - 1
+        a = tabla[k, np.minimum(i, ultimo)]
+        b = tabla[k, np.clip(j - 2 ** k, 0, ultimo)]
+        resultado = np.where(longitud > 0, operacion(a, b), np.nan)
+        return resultado[()] if np.ndim(resultado) == 0 else resultado
+
+    def promedio(self, inicio, fin):
+        """Tasa promedio entre dos fechas (NaN si no hay datos en el rango)"""
+        i, j = self._rango(inicio, fin)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            resultado = (self.acumulada[j] - self.acumulada[i]) / (j - i)
+        return resultado[()] if np.ndim(resultado) == 0 else resultado
+
+    def minimo(self, inicio, fin):
+        return self._consultar(self.tabla_min, np.minimum, inicio, fin)
+
+    def maximo(self, inicio, fin):
+        return self._consultar(self.tabla_max, np.maximum, inicio, fin)
+
+    def vigente(self, fechas):
+        """Tasa vigente en cada fecha: el último dato publicado a esa fecha (el primero si es anterior)"""
+        i = np.searchsorted(self.fechas, np.asarray(fechas, dtype="datetime64[D]"), side="right") - 1
+        return self.tasas[np.maximum(i, 0)]
+
+    def serie(self):
+        return pd.Series(self.tasas, index=pd.DatetimeIndex(self.fechas, name="Date"), name="Price")
+
+@lru_cache(maxsize=None)
+def cargar_tbill(ruta=RUTA_DATOS):
+    """Serie del T-bill leída una sola vez por proceso"""
+    return SerieTBill.desde_csv(ruta)
+
+def tasa_libre_riesgo(fechas, periodos=252, ruta=RUTA_DATOS):
+    """Tasa libre de riesgo por periodo (decimal) alineada con las fechas de una serie de retornos.
+
+    Regresa una Series indexada por 'fechas' con la tasa anual vigente del T-bill
+    dividida entre 'periodos'; restarla a los retornos da el exceso de cada día.
+    """
+    indice = pd.DatetimeIndex(fechas)
+    tasas = cargar_tbill(ruta).vigente(indice.to_numpy()) / 100 / periodos
+    return pd.Series(tasas, index=indice, name="rf")
+
+def resolver_tasa(tasa, fechas, periodos=252, escala=1, ruta=RUTA_DATOS):
+    """La tasa libre de riesgo dada o, si es None, la del T-bill alineada con las fechas.
+
+    'escala' pasa la tasa del T-bill a las unidades de los retornos (100 si
+    están en %). Sin fechas no hay con qué alinear el T-bill: ValueError.
+    """
+    if tasa is not None:
+        return tasa
+    if not isinstance(fechas, pd.DatetimeIndex):
+        raise ValueError("Sin fechas no se puede alinear el T-bill; pase la tasa libre de riesgo")
+    return tasa_libre_riesgo(fechas, periodos, ruta) * escala
+
+def resolver_tasa_anual(tasa, fechas, ruta=RUTA_DATOS):
+    """La tasa anual dada o, si es None, el promedio del T-bill en el periodo de las fechas (para los optimizadores)"""
+    if tasa is not None:
+        return tasa
+    if not isinstance(fechas, pd.DatetimeIndex) or not len(fechas):
+        raise ValueError("Sin fechas no se puede promediar el T-bill; pase la tasa libre de riesgo")
+    return tasa_anual_promedio(fechas[0], fechas[-1], ruta)
+
+def tasa_anual_promedio(inicio, fin, ruta=RUTA_DATOS):
+    """Tasa anual promedio (decimal) del T-bill entre dos fechas, para los optimizadores"""
+    return cargar_tbill(ruta).promedio(inicio, fin) / 100
@@ -0,0 +1,99 @@
+#Descargas concurrentes contra CSVs locales en lugar de Yahoo (FetcherInestable + CsvFetcher)
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import price_store
+from descargas import FetcherInestable, iterar_descargas
+from price_store import CsvFetcher, PriceStore
+
+@pytest.fixture
+def fixtures(tmp_path):
+    """CSVs de precios diarios de 2020; VIEJO sólo tiene datos de 2010"""
+    directorio = tmp_path / "fixtures"
+    directorio.mkdir()
+    fechas = pd.bdate_range("2020-01-01", "2020-12-31")
+    for ticker in ["LENTO", "RAPIDO"]:
+        pd.DataFrame({"Close": np.linspace(100, 120, len(fechas))}, index=pd.Index(fechas, name="Date")) \
+            .to_csv(directorio / f"{ticker}.csv")
+    viejo = pd.bdate_range("2010-01-01", "2010-03-31")
+    pd.DataFrame({"Close": np.ones(len(viejo))}, index=pd.Index(viejo, name="Date")).to_csv(directorio / "VIEJO.csv")
+    return directorio
+
+@pytest.fixture
+def fetcher(tmp_path, fixtures):
+    inestable = FetcherInestable(CsvFetcher(fixtures), latencia={"LENTO": 0.3}, fallas=2)
+    price_store.configurar_almacen(tmp_path / "store", inestable)
+    yield inestable
+    price_store._almacen = None
+
+def test_reintentos_y_orden_de_llegada(fetcher):
+    resultados = list(iterar_descargas(["LENTO", "RAPIDO", "FALTANTE", "VIEJO"], "2020-01-01", "2021-01-01",
+                                       reintentos=3, espera=0.01))
+    orden = [ticker for ticker, _, _ in resultados]
+    por_ticker = {ticker: (serie, error) for ticker, serie, error in resultados}
+
+    # Llegan en el orden en que terminan, no en el pedido
+    assert sorted(orden) == ["FALTANTE", "LENTO", "RAPIDO", "VIEJO"]
+    assert orden.index("RAPIDO") < orden.index("LENTO")
+    assert orden[-1] == "LENTO"
+
+    # Dos fallas simuladas y luego la descarga buena
+    for ticker in ["LENTO", "RAPIDO"]:
+        serie, error = por_ticker[ticker]
+        assert error is None and len(serie) == len(pd.bdate_range("2020-01-01", "2020-12-31"))
+        assert fetcher.llamadas[ticker] == 3
+
+    # Sin archivo o con descarga vacía: se agotan los reintentos y se reporta el error
+    serie, error = por_ticker["FALTANTE"]
+    assert serie is None and isinstance(error, FileNotFoundError)
+    serie, error = por_ticker["VIEJO"]
+    assert serie is None and isinstance(error, LookupError)
+    assert fetcher.llamadas["FALTANTE"] == fetcher.llamadas["VIEJO"] == 4
+
+def test_actualizaciones_concurrentes_no_duplican_fechas(tmp_path, fixtures):
+    almacen = PriceStore(tmp_path / "concurrente", FetcherInestable(CsvFetcher(fixtures), latencia=0.05))
+    hilos = [threading.Thread(target=almacen.obtener, args=("RAPIDO", "2020-01-01", "2020-07-01"))
+             for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    almacen.obtener("RAPIDO", "2020-01-01", "2021-01-01")
+
+    guardado = almacen.leer("RAPIDO")
+    assert guardado.index.is_unique and guardado.index.is_monotonic_increasing
+    assert len(guardado) == len(pd.bdate_range("2020-01-01", "2020-12-31"))
+
+def test_cola_sin_sesiones_no_vuelve_a_descargar(tmp_path, fixtures, monkeypatch):
+    contador = FetcherInestable(CsvFetcher(fixtures))
+    almacen = PriceStore(tmp_path / "fin_de_semana", contador)
+
+    def reloj(momento):
+        class Reloj(price_store.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return pd.Timestamp(momento).to_pydatetime()
+        monkeypatch.setattr(price_store, "datetime", Reloj)
+
+    # Sábado: la descarga completa llega hasta el último viernes del CSV
+    reloj("2021-01-02 10:00")
+    almacen.obtener("RAPIDO", "2020-01-01")
+    assert contador.llamadas["RAPIDO"] == 1
+
+    # Domingo a varias horas y lunes antes del cierre: no hay sesiones completas faltantes
+    for momento in ["2021-01-03 10:00", "2021-01-03 11:00", "2021-01-03 12:00", "2021-01-04 10:00"]:
+        reloj(momento)
+        almacen.obtener("RAPIDO", "2020-01-01")
+    assert contador.llamadas["RAPIDO"] == 1
+    assert almacen._leer_meta(almacen._rutas("RAPIDO", "Close")[2])["hasta"] == "2021-01-04"
+
+    # Martes: falta la sesión del lunes y el CSV no la tiene, así que el rango no avanza
+    reloj("2021-01-05 10:00")
+    almacen.obtener("RAPIDO", "2020-01-01")
+    assert contador.llamadas["RAPIDO"] == 2
+    assert almacen._leer_meta(almacen._rutas("RAPIDO", "Close")[2])["hasta"] == "2021-01-04"
+    assert len(almacen.leer("RAPIDO")) == len(pd.bdate_range("2020-01-01", "2020-12-31"))
@@ -0,0 +1,142 @@
+#VaR y CVaR con varios métodos: histórico, normal, Cornish-Fisher y filtrados (EWMA y GARCH)
+#
+#Todos los métodos reciben un vector de niveles alpha y regresan la curva
+#completa en una sola llamada; el VaR es el percentil de los retornos (negativo).
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from metricas import _percentil_ordenada, estadisticas_columnas
+from panel import como_matriz, etiquetas
+
+METODOS = ['historico', 'normal', 'cornish_fisher', 'ewma', 'garch']
+
+def _cola_historica(x, alphas):
+    """VaR y CVaR históricos (A x N) ordenando cada columna una sola vez"""
+    ordenada = np.sort(x, axis=0)  # Los NaN quedan al final de cada columna
+    n = np.maximum((~np.isnan(x)).sum(axis=0), 1)
+    var = _percentil_ordenada(ordenada, n, alphas[:, np.newaxis])
+
+    # Sólo los primeros renglones pueden quedar en la cola de algún nivel
+    limite = max(int((ordenada <= var.max(axis=0)).sum(axis=0).max()), 1)
+    cabeza = ordenada[:limite]
+    k = (cabeza[:, np.newaxis, :] <= var[np.newaxis]).sum(axis=0)
+    acumulada = np.cumsum(np.nan_to_num(cabeza), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cvar = np.take_along_axis(acumulada, np.maximum(k - 1, 0), axis=0) / k
+    return var, cvar
+
+def _cola_normal(media, volatilidad, alphas):
+    normal = NormalDist()
+    z = np.array([normal.inv_cdf(a) for a in alphas])[:, np.newaxis]
+    densidad = np.exp(-z ** 2 / 2) / np.sqrt(2 * np.pi)
+    return media + volatilidad * z, media - volatilidad * densidad / alphas[:, np.newaxis]
+
+def _cola_cornish_fisher(media, volatilidad, sesgo, curtosis, alphas):
+    """Cuantil de Cornish-Fisher y su CVaR exacto.
+
+    El CVaR integra el cuantil ajustado bajo la normal hasta z_alpha con los
+    momentos truncados de la normal, así que no hace falta integrar numéricamente.
+    """
+    normal = NormalDist()
+    z = np.array([normal.inv_cdf(a) for a in alphas])[:, np.newaxis]
+    a = alphas[:, np.newaxis]
+    S, K = sesgo, curtosis
+    z_cf = (z + (z ** 2 - 1) * S / 6 + (z ** 3 - 3 * z) * K / 24
+            - (2 * z ** 3 - 5 * z) * S ** 2 / 36)
+
+    # Integrales de z^k por la densidad normal de -inf a z
+    densidad = np.exp(-z ** 2 / 2) / np.sqrt(2 * np.pi)
+    I0, I1 = a, -densidad
+    I2, I3 = a - z * densidad, -(z ** 2 + 2) * densidad
+    cola = (I1 + (I2 - I0) * S / 6 + (I3 - 3 * I1) * K / 24 - (2 * I3 - 5 * I1) * S ** 2 / 36) / a
+    return media + volatilidad * z_cf, media + volatilidad * cola
+
+def _varianza_condicional(r2, omega, a, b, inicial):
+    """Recursión sigma2_t = omega + a r2_{t-1} + b sigma2_{t-1} como un filtro lineal.
+
+    Regresa T + 1 varianzas: la última es el pronóstico del día siguiente.
+    """
+    from scipy.signal import lfilter
+
+    nivel = omega / (1 - b)
+    entrada = np.append(r2, 0.0)
+    return lfilter([0.0, a], [1.0, -b], entrada, zi=[inicial - nivel])[0] + nivel
+
+def _ajustar_garch(d):
+    """GARCH(1,1) por máxima verosimilitud con la varianza fijada a la muestral"""
+    from scipy.optimize import minimize
+
+    r2 = d * d
+    varianza = r2.mean()
+
+    def log_verosimilitud_negativa(parametros):
+        a, b = parametros
+        if a + b >= 0.999:
+            return 1e10
+        sigma2 = _varianza_condicional(r2, varianza * (1 - a - b), a, b, varianza)[:-1]
+        return 0.5 * np.sum(np.log(sigma2) + r2 / sigma2)
+
+    resultado = minimize(log_verosimilitud_negativa, [0.08, 0.90], method='L-BFGS-B',
+                         bounds=[(1e-6, 0.5), (0.0, 0.998)])
+    a, b = resultado.x
+    return varianza * (1 - a - b), a, b
+
+def _residuos_filtrados(x, metodo, lambda_ewma):
+    """Residuos estandarizados (T x N) y volatilidad pronosticada de cada columna"""
+    residuos = np.full(x.shape, np.nan)
+    pronostico = np.full(x.shape[1], np.nan)
+    medias = np.nanmean(x, axis=0)
+    for j in range(x.shape[1]):
+        validos = ~np.isnan(x[:, j])
+        d = x[validos, j] - medias[j]
+        if metodo == 'ewma':
+            sigma2 = _varianza_condicional(d * d, 0.0, 1 - lambda_ewma, lambda_ewma, d.var())
+        else:
+            omega, a, b = _ajustar_garch(d)
+            sigma2 = _varianza_condicional(d * d, omega, a, b, d.var())
+        residuos[validos, j] = d / np.sqrt(sigma2[:-1])
+        pronostico[j] = np.sqrt(sigma2[-1])
+    return residuos, medias, pronostico
+
+def var_cvar(retornos, alphas=(0.01, 0.025, 0.05, 0.10), metodo='historico', lambda_ewma=0.94):
+    """VaR y CVaR de cada columna para todos los niveles alpha.
+
+    metodo: 'historico', 'normal', 'cornish_fisher' (con el sesgo y la curtosis
+    de estadisticas_columnas), 'ewma' o 'garch' (simulación histórica filtrada:
+    cuantiles de los residuos estandarizados escalados por la volatilidad
+    pronosticada). Regresa dos DataFrames (niveles x activos): VaR y CVaR.
+    """
+    x = como_matriz(retornos)
+    x = x.reshape(-1, 1) if x.ndim == 1 else x
+    alphas = np.atleast_1d(np.asarray(alphas, dtype=float))
+
+    if metodo == 'historico':
+        var, cvar = _cola_historica(x, alphas)
+    elif metodo in ('normal', 'cornish_fisher'):
+        e = estadisticas_columnas(x)
+        if metodo == 'normal':
+            var, cvar = _cola_normal(e['media'], e['volatilidad'], alphas)
+        else:
+            var, cvar = _cola_cornish_fisher(e['media'], e['volatilidad'], e['sesgo'], e['curtosis'], alphas)
+    elif metodo in ('ewma', 'garch'):
+        residuos, medias, pronostico = _residuos_filtrados(x, metodo, lambda_ewma)
+        var_z, cvar_z = _cola_historica(residuos, alphas)
+        var, cvar = medias + pronostico * var_z, medias + pronostico * cvar_z
+    else:
+        raise ValueError(f"Método desconocido: {metodo}")
+
+    _, columnas = etiquetas(retornos)
+    indice = pd.Index(alphas, name='alpha')
+    return (pd.DataFrame(var, index=indice, columns=columnas),
+            pd.DataFrame(cvar, index=indice, columns=columnas))
+
+def curva_riesgo_cola(retornos, alphas, metodos=METODOS, lambda_ewma=0.94):
+    """VaR y CVaR de todos los métodos: diccionario metodo -> {'VaR': DataFrame, 'CVaR': DataFrame}"""
+    curvas = {}
+    for metodo in metodos:
+        var, cvar = var_cvar(retornos, alphas, metodo, lambda_ewma)
+        curvas[metodo] = {'VaR': var, 'CVaR': cvar}
+    return curvas
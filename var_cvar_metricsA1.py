@@ -1,8 +1,10 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import streamlit as st
 import matplotlib.pyplot as plt
+import datos_compartidos
+from panel import PanelRetornos
+from tbill import tasa_libre_riesgo
 
 # Configuración global para Streamlit
 st.set_page_config(
@@ -36,16 +38,11 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# Función para calcular CVaR
-def calculate_cvar(returns, alpha=0.05):
-    var = np.percentile(returns, 100 * alpha)
-    cvar = returns[returns <= var].mean()
-    return cvar
-
 # Descargar datos de los ETFs
 def obtener_datos(etfs, start_date, end_date):
-    data = yf.download(etfs, start=start_date, end=end_date)["Adj Close"]
-    daily_returns = data.pct_change() * 100  # Rendimientos en %
+    data = datos_compartidos.precios(etfs, start_date, end_date, campo="Adj Close")
+    # Rendimientos en % en un solo panel float32 que comparten todos los cálculos de la página
+    daily_returns = PanelRetornos.desde_precios(data[etfs], dtype="float32", escala=100)
     return data, daily_returns
 
 # Configurar parámetros
@@ -56,41 +53,18 @@ end_date = "2023-12-31"
 # Descargar datos
 data, daily_returns = obtener_datos(etfs, start_date, end_date)
 
-# Calcular métricas
-metrics = {}
-risk_free_rate = 0.00116 / 252  # Tasa libre de riesgo diaria
-
-for etf in etfs:
-    etf_returns = daily_returns[etf].dropna()
-
-    # Calcular métricas
-    mean = etf_returns.mean()
-    skewness = etf_returns.skew()
-    kurtosis = etf_returns.kurtosis()
-    var = np.percentile(etf_returns, 5)
-    cvar = calculate_cvar(etf_returns)
-    sharpe_ratio = (mean - risk_free_rate) / etf_returns.std()
-    downside_returns = etf_returns[etf_returns < 0]
-    sortino_ratio = (mean - risk_free_rate) / downside_returns.std()
-
-    # Guardar métricas en el diccionario
-    metrics[etf] = {
-        "Mean": mean,
-        "Skewness": skewness,
-        "Excess Kurtosis": kurtosis,
-        "VaR (95%)": var,
-        "CVaR (95%)": cvar,
-        "Sharpe Ratio": sharpe_ratio,
-        "Sortino Ratio": sortino_ratio,
-    }
-
-metrics_df = pd.DataFrame(metrics).T.round(4)
+# Calcular métricas (artefactos compartidos por todas las páginas del proceso)
+risk_free_rate = tasa_libre_riesgo(daily_returns.index) * 100  # T-bill diario vigente, en %
+metrics_df = datos_compartidos.metricas_etfs(daily_returns, risk_free_rate)
+metricas_moviles = datos_compartidos.metricas_moviles(daily_returns, 252, risk_free_rate)
+niveles_alpha = np.linspace(0.005, 0.10, 20)
+curvas_cola = datos_compartidos.riesgo_cola(daily_returns, niveles_alpha)
 
 # Función para graficar CVaR/VaR
-def graficar_var_cvar(etf, returns):
+def graficar_var_cvar(etf, returns, metrics):
     etf_returns = returns[etf].dropna()
-    var = np.percentile(etf_returns, 5)
-    cvar = calculate_cvar(etf_returns)
+    var = metrics.loc[etf, "VaR (95%)"]
+    cvar = metrics.loc[etf, "CVaR (95%)"]
 
     plt.figure(figsize=(12, 6))
     plt.plot(etf_returns.index, etf_returns, color="#2C3E50", label=f'Daily Returns - {etf}')
@@ -123,9 +97,30 @@ etf_seleccionado = st.sidebar.selectbox(
 
 # Mostrar gráfica del ETF seleccionado
 st.subheader(f"Var/CVaR plot for {etf_seleccionado}")
-grafica = graficar_var_cvar(etf_seleccionado, daily_returns)
+grafica = graficar_var_cvar(etf_seleccionado, daily_returns, metrics_df)
 st.pyplot(grafica)
 
+# Métricas en ventana móvil de 252 días
+st.subheader(f"Rolling 252-day metrics for {etf_seleccionado}")
+metrica_movil = st.selectbox("Select a metric:", list(metricas_moviles.keys()))
+st.line_chart(metricas_moviles[metrica_movil][etf_seleccionado].dropna())
+
+# Curva de riesgo de cola con todos los métodos
+nombres_metodos = {
+    "historico": "Historical",
+    "normal": "Gaussian",
+    "cornish_fisher": "Cornish-Fisher",
+    "ewma": "EWMA-filtered",
+    "garch": "GARCH-filtered",
+}
+st.subheader(f"Tail-risk curve for {etf_seleccionado}")
+medida = st.radio("Measure:", ["VaR", "CVaR"], horizontal=True)
+curva = pd.DataFrame({
+    nombre: curvas_cola[metodo][medida][etf_seleccionado].to_numpy()
+    for metodo, nombre in nombres_metodos.items()
+}, index=pd.Index(100 * (1 - niveles_alpha), name="Confidence level (%)"))
+st.line_chart(curva)
+
 # Mostrar tabla con métricas
 st.subheader("Metrics for each ETF")
 st.dataframe(metrics_df.style.background_gradient(cmap="Blues"))
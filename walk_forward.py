@@ -0,0 +1,96 @@
+#Optimización walk-forward: reestimar, reoptimizar y aplicar fuera de muestra
+#
+#Uso: python walk_forward.py
+
+import numpy as np
+import pandas as pd
+
+from backtest import backtest_portafolios
+from covarianza import MomentosMoviles
+from optimizador import max_sharpe, min_varianza, min_varianza_objetivo
+from tbill import resolver_tasa, tasa_anual_promedio
+
+def walk_forward(retornos, ventana=252 * 3, paso=21, esquema='rolling', metodo='max_sharpe',
+                 objetivo=None, limites=(0, None), tasa_libre_riesgo=None, costo_proporcional=0.0,
+                 estimador='muestral'):
+    """Reoptimiza cada 'paso' días con los 'ventana' días previos y aplica los pesos fuera de muestra.
+
+    esquema: 'rolling' (ventana fija) o 'expanding' (toda la historia hasta la fecha).
+    metodo: 'max_sharpe', 'min_varianza' u 'objetivo' (mínima varianza con
+    rendimiento anual 'objetivo'). estimador: covarianza 'muestral',
+    'ledoit_wolf' u 'oas', todas actualizadas de forma incremental al mover la
+    ventana. Cada reoptimización arranca desde el conjunto activo de la
+    anterior. El costo proporcional se cobra sobre la rotación en cada fecha de
+    reoptimización. Sin tasa libre de riesgo (anual) cada optimización usa el
+    promedio del T-bill en su ventana y el backtest fuera de muestra la tasa
+    diaria vigente.
+    """
+    R = np.asarray(retornos, dtype=float)
+    T, N = R.shape
+    if ventana >= T:
+        raise ValueError("La ventana de estimación es más larga que la historia disponible")
+
+    momentos = MomentosMoviles(N)
+    momentos.agregar(R[:ventana])
+    fechas_ajuste = np.arange(ventana, T, paso)
+
+    indice = retornos.index
+    tasa_diaria = resolver_tasa(None if tasa_libre_riesgo is None else tasa_libre_riesgo / 252, indice[ventana:])
+    if tasa_libre_riesgo is None:
+        inicios = fechas_ajuste - ventana if esquema == 'rolling' else np.zeros_like(fechas_ajuste)
+        tasas = tasa_anual_promedio(indice[inicios], indice[fechas_ajuste - 1])
+    else:
+        tasas = np.full(len(fechas_ajuste), tasa_libre_riesgo)
+
+    pesos = np.empty((len(fechas_ajuste), N))
+    anterior = None
+    for i, t in enumerate(fechas_ajuste):
+        if i > 0:
+            momentos.agregar(R[fechas_ajuste[i - 1]:t])
+            if esquema == 'rolling':
+                momentos.quitar(R[fechas_ajuste[i - 1] - ventana:t - ventana])
+        mu, cov = momentos.estadisticos(metodo=estimador)
+        tasa = tasas[i]
+
+        if metodo == 'max_sharpe':
+            anterior = max_sharpe(mu, cov, tasa, limites, inicio=anterior)
+        elif metodo == 'min_varianza':
+            anterior = min_varianza(mu, cov, limites, tasa, inicio=anterior)
+        elif metodo == 'objetivo':
+            anterior = min_varianza_objetivo(mu, cov, objetivo, limites, tasa, inicio=anterior)
+        else:
+            raise ValueError(f"Método desconocido: {metodo}")
+        pesos[i] = anterior['pesos']
+
+    # Pesos de cada día fuera de muestra y retornos en un solo paso
+    duraciones = np.diff(np.append(fechas_ajuste, T))
+    pesos_diarios = np.repeat(pesos, duraciones, axis=0)
+    retornos_oos = np.einsum('ij,ij->i', R[ventana:], pesos_diarios)
+
+    rotacion = np.abs(np.diff(pesos, axis=0, prepend=np.zeros((1, N)))).sum(axis=1)
+    retornos_oos[fechas_ajuste - ventana] -= costo_proporcional * rotacion
+
+    columnas = retornos.columns
+    retornos_oos = pd.DataFrame(retornos_oos, index=indice[ventana:], columns=['Walk-Forward'])
+    resultado = backtest_portafolios(retornos_oos, np.ones((1, 1)), ['Walk-Forward'], tasa_diaria)
+    resultado['pesos'] = pd.DataFrame(pesos, index=indice[fechas_ajuste], columns=columnas)
+    resultado['rotacion'] = pd.Series(rotacion, index=indice[fechas_ajuste], name='Rotación')
+    return resultado
+
+def main():
+    from price_store import obtener_precios
+    from portfolio_config import simbolos
+
+    precios = obtener_precios(simbolos, '2010-01-01').ffill().dropna()
+    retornos = precios.pct_change().dropna()
+    for esquema in ['rolling', 'expanding']:
+        for metodo in ['max_sharpe', 'min_varianza']:
+            resultado = walk_forward(retornos, esquema=esquema, metodo=metodo, costo_proporcional=0.001)
+            metricas = resultado['metricas'].iloc[0]
+            print(f"{esquema:>9} {metodo:>12}: {len(resultado['pesos'])} reoptimizaciones, "
+                  f"rendimiento anual {metricas['Rendimiento Anual (%)']:.2f}%, "
+                  f"sharpe {metricas['Sharpe Ratio']:.2f}, "
+                  f"máximo drawdown {metricas['Máximo Drawdown (%)']:.2f}%")
+
+if __name__ == "__main__":
+    main()